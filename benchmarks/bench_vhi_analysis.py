@@ -0,0 +1,91 @@
+"""
+Порівняння векторних calculate_vhi_extremes/drought_years з vhi_analysis
+з початковими циклами з lab_2.ipynb (результати мають збігатися).
+
+Запуск з кореня репозиторію: python benchmarks/bench_vhi_analysis.py
+"""
+import os
+import sys
+from timeit import repeat
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vhi_analysis import calculate_vhi_extremes, drought_years, drought_years_batch, drought_count, \
+    drought_flags_by_year, filter_years
+
+
+############# Початкові версії з лаби 2 ###############
+
+def calculate_vhi_extremes_loop(df, start_year=None, end_year=None):
+    df = filter_years(df, start_year, end_year)
+    vhi_extremes = []
+    for (province_id, year), group_df in df.groupby(['province_ID', 'Year']):
+        vhi_extremes.append({'province_ID': province_id, 'Year': year,
+                             'Min_VHI': group_df['VHI'].min(), 'Max_VHI': group_df['VHI'].max()})
+    return pd.DataFrame(vhi_extremes)
+
+
+def drought_count_loop(df, percentage, type_of_drought, start_year=None, end_year=None):
+    df = filter_years(df, start_year, end_year)
+    drought_count = {}
+    for year, group_df in df.groupby('Year'):
+        total_areas = len(group_df['province_ID'].unique())
+        if type_of_drought == "extreme":
+            drought_areas = group_df[group_df['VHI'] < 15]['province_ID'].nunique()
+        elif type_of_drought == "moderate":
+            drought_areas = group_df[(group_df['VHI'] > 15) & (group_df['VHI'] < 35)]['province_ID'].nunique()
+        if drought_areas / total_areas > percentage / 100:
+            drought_count[year] = (drought_areas, round((drought_areas / total_areas) * 100, 2))
+    return drought_count
+
+########################################################
+
+
+def synthetic_vhi(n_provinces=25, start_year=1982, end_year=2024, seed=26):
+    # дані такої ж форми, як після dataframer: область x рік x 52 тижні
+    rng = np.random.default_rng(seed)
+    provinces, years, weeks = np.meshgrid(np.arange(1, n_provinces + 1),
+                                          np.arange(start_year, end_year + 1),
+                                          np.arange(1, 53), indexing='ij')
+    return pd.DataFrame({'province_ID': provinces.ravel(), 'Year': years.ravel(), 'Week': weeks.ravel(),
+                         'VHI': rng.uniform(5, 80, provinces.size).round(2)})
+
+
+def best_time(func, repeats=5):
+    return min(repeat(func, number=1, repeat=repeats))
+
+
+def main():
+    df = synthetic_vhi()
+    queries = [(percentage, type_of_drought, 1990, 2024)
+               for percentage in range(5, 65, 5) for type_of_drought in ("extreme", "moderate")]
+
+    # перевірка, що результати збігаються
+    pd.testing.assert_frame_equal(calculate_vhi_extremes_loop(df, 2005, 2024),
+                                  calculate_vhi_extremes(df, 2005, 2024), check_dtype=False)
+    counts = drought_flags_by_year(df)
+    for percentage, type_of_drought, start_year, end_year in queries:
+        assert drought_count_loop(df, percentage, type_of_drought, start_year, end_year) == \
+            drought_count(counts, percentage, type_of_drought, start_year, end_year)
+
+    results = {
+        'calculate_vhi_extremes': (best_time(lambda: calculate_vhi_extremes_loop(df, 2005, 2024)),
+                                   best_time(lambda: calculate_vhi_extremes(df, 2005, 2024))),
+        'drought_years': (best_time(lambda: drought_count_loop(df, 10, "extreme", 2000, 2024)),
+                          best_time(lambda: drought_years(df, 10, "extreme", 2000, 2024))),
+        f'{len(queries)} drought queries': (
+            best_time(lambda: [drought_count_loop(df, *query) for query in queries], repeats=3),
+            best_time(lambda: drought_years_batch(df, queries), repeats=3)),
+    }
+
+    print(f"Рядків у фреймі: {len(df)}")
+    print(f"{'Задача':<28} | {'Цикл (с)':>10} | {'Вектор (с)':>10} | {'Прискорення':>11}")
+    print("-" * 68)
+    for name, (loop_time, vector_time) in results.items():
+        print(f"{name:<28} | {loop_time:>10.4f} | {vector_time:>10.4f} | {loop_time / vector_time:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
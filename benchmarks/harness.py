@@ -0,0 +1,144 @@
+"""
+Мінімальний харнес для бенчмарків: прогрів, повторні запуски, медіана/p95,
+пікова пам'ять, прогін по розмірах входу і результати у JSON для порівняння версій.
+"""
+import gc
+import os
+import json
+import time
+import platform
+import datetime
+import subprocess
+import tracemalloc
+
+import numpy as np
+
+
+class Case:
+    """
+    Один бенчмарк.
+
+    Параметри:
+    name (str): Назва (унікальна в межах набору).
+    make_input (callable): size -> вхідні дані; викликається поза вимірюванням.
+    func (callable): Функція, що вимірюється; отримує результат make_input.
+    sizes (list або None): Розміри входу за замовчуванням.
+    """
+
+    def __init__(self, name, make_input, func, sizes=None):
+        self.name = name
+        self.make_input = make_input
+        self.func = func
+        self.sizes = sizes or [None]
+
+
+def measure(func, arg, warmup=2, repeat=10):
+    """
+    Час одного виклику func(arg): warmup прогрівочних запусків, далі repeat вимірювань.
+    Пам'ять міряю окремим запуском під tracemalloc, щоб він не спотворював час.
+
+    Повертає:
+    Словник з median/p95/min/mean (секунди), repeat та peak_bytes.
+    """
+    for _ in range(warmup):
+        func(arg)
+
+    times = np.empty(repeat)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for i in range(repeat):
+            start = time.perf_counter()
+            func(arg)
+            times[i] = time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'median': float(np.median(times)), 'p95': float(np.percentile(times, 95)),
+            'min': float(times.min()), 'mean': float(times.mean()),
+            'repeat': repeat, 'peak_bytes': int(peak)}
+
+
+def run_cases(suite, cases, sizes=None, warmup=2, repeat=10, log=print):
+    # прогін усіх кейсів набору; sizes перекриває розміри кейсів
+    results = []
+    for case in cases:
+        for size in sizes or case.sizes:
+            arg = case.make_input(size)
+            stats = measure(case.func, arg, warmup, repeat)
+            results.append({'suite': suite, 'name': case.name, 'size': size, **stats})
+            if log:
+                log(format_row(results[-1]))
+    return results
+
+
+def format_row(result):
+    size = '-' if result['size'] is None else result['size']
+    return (f"{result['suite'] + '/' + result['name']:<42} {size:>9} | "
+            f"median {result['median'] * 1e3:>10.3f} мс | p95 {result['p95'] * 1e3:>10.3f} мс | "
+            f"пам'ять {result['peak_bytes'] / 2**20:>8.2f} МБ")
+
+
+def environment():
+    # що потрібно знати, щоб порівнювати числа між запусками
+    versions = {'python': platform.python_version(), 'numpy': np.__version__}
+    for module in ('pandas', 'scipy', 'sklearn'):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            pass
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'timestamp': datetime.datetime.now().isoformat(timespec='seconds'), 'commit': commit,
+            'machine': platform.machine(), 'platform': platform.platform(), 'versions': versions}
+
+
+def save_results(path, results):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'results': results}, f, ensure_ascii=False, indent=1)
+    return path
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(old, new, threshold=0.1):
+    """
+    Порівнює два файли результатів (вже завантажені через load_results).
+    Регресія - лише якщо медіана зросла більше ніж на threshold і
+    нова медіана більша за старий p95 (тобто різниця більша за шум).
+
+    Повертає:
+    Список словників з полями suite, name, size, old, new, ratio, status.
+    """
+    old_results = {(r['suite'], r['name'], r['size']): r for r in old['results']}
+    rows = []
+    for result in new['results']:
+        key = (result['suite'], result['name'], result['size'])
+        if key not in old_results:
+            continue
+        before = old_results[key]
+        ratio = result['median'] / before['median'] if before['median'] else float('inf')
+        if ratio > 1 + threshold and result['median'] > before['p95']:
+            status = 'regression'
+        elif ratio < 1 - threshold and result['p95'] < before['median']:
+            status = 'improvement'
+        else:
+            status = 'noise'
+        rows.append({'suite': key[0], 'name': key[1], 'size': key[2], 'old': before['median'],
+                     'new': result['median'], 'ratio': ratio, 'status': status})
+    return rows
@@ -0,0 +1,61 @@
+"""
+Запуск бенчмарків і порівняння результатів між версіями.
+
+Приклади (з кореня репозиторію):
+python benchmarks/run.py --suite lab4 lab5 --output results/before.json
+python benchmarks/run.py --suite lab5 --sizes 1000 1000000 --repeat 20
+python benchmarks/run.py --compare results/before.json results/after.json
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from harness import run_cases, save_results, load_results, compare
+from suites import SUITES
+
+
+def print_comparison(rows):
+    print(f"{'Бенчмарк':<42} {'Розмір':>9} | {'Було (мс)':>10} | {'Стало (мс)':>10} | {'x':>6} | Статус")
+    print("-" * 100)
+    for row in rows:
+        size = '-' if row['size'] is None else row['size']
+        print(f"{row['suite'] + '/' + row['name']:<42} {size:>9} | {row['old'] * 1e3:>10.3f} | "
+              f"{row['new'] * 1e3:>10.3f} | {row['ratio']:>6.2f} | {row['status']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки лаб")
+    parser.add_argument('--suite', nargs='+', choices=sorted(SUITES), default=sorted(SUITES))
+    parser.add_argument('--sizes', nargs='+', type=int, help="розміри входу замість стандартних")
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output', help="куди зберегти результати (JSON)")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="порівняти два файли результатів")
+    parser.add_argument('--threshold', type=float, default=0.1, help="мінімальна відносна зміна медіани")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        rows = compare(load_results(args.compare[0]), load_results(args.compare[1]), args.threshold)
+        print_comparison(rows)
+        # ненульовий код, щоб регресію було видно у скриптах
+        return 1 if any(row['status'] == 'regression' for row in rows) else 0
+
+    results = []
+    for suite in args.suite:
+        try:
+            cases = SUITES[suite]()
+        except ImportError as e:
+            print(f"=] Набір {suite} пропущено: {e}")
+            continue
+        results += run_cases(suite, cases, args.sizes, args.warmup, args.repeat)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        save_results(args.output, results)
+        print(f"=] Результати збережено у {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+"""
+Набори бенчмарків для лаб. Дані синтетичні, тому запуск не залежить від
+завантажених датасетів. Кожен набір імпортує свої модулі ліниво: якщо
+залежності немає, набір пропускається, а решта працює.
+"""
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in (ROOT, *(os.path.join(ROOT, lab) for lab in ('lab4', 'lab5', 'lab6', 'lab7'))):
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+
+from harness import Case
+
+
+############# lab4: фільтри по датасету household power ###############
+
+def synthetic_power(size, seed=26):
+    # ті самі колонки й діапазони, що й у household_power_consumption.txt
+    import pandas as pd
+    from power_data import NUMERIC_COLUMNS
+
+    rng = np.random.default_rng(seed)
+    timestamp = np.int64(1166289840) + 60 * np.arange(size, dtype=np.int64)
+    values = {
+        'Global_active_power': rng.gamma(1.5, 0.8, size) * 1.5,
+        'Global_reactive_power': rng.uniform(0, 1.4, size),
+        'Voltage': rng.normal(240, 3.2, size),
+        'Global_intensity': rng.gamma(1.5, 3, size) * 1.5,
+        'Sub_metering_1': rng.choice([0, 0, 0, 1, 2, 38], size),
+        'Sub_metering_2': rng.choice([0, 0, 1, 2, 26, 70], size),
+        'Sub_metering_3': rng.choice([0, 1, 17, 18, 19], size),
+    }
+    columns = {'timestamp': timestamp, **{col: np.asarray(values[col], dtype=np.float32) for col in NUMERIC_COLUMNS}}
+    frame = pd.DataFrame({col: columns[col].astype(np.float64) for col in NUMERIC_COLUMNS})
+    frame['datetime'] = pd.to_datetime(timestamp, unit='s')
+    return {'columns': columns, 'frame': frame}
+
+
+def fourth_task_input(size):
+    # вибірка з task 4 робиться поза вимірюванням - міряю лише середнє
+    data = synthetic_power(size)
+    index = np.random.default_rng(26).integers(0, size, 500_000)
+    data['sample'] = {col: data['columns'][col][index] for col in ('Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3')}
+    return data
+
+
+def synthetic_bands(size, seed=26):
+    # таблиця як cylinder bands: числові колонки з ~5% пропусків і категоріальна press_type
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({f'x{i}': rng.normal(i, 1 + i, size) for i in range(20)})
+    frame = frame.mask(rng.random(frame.shape) < 0.05)
+    frame['press_type'] = rng.choice(['Motter70', 'Motter94', 'WoodHoe70', 'Albert70'], size)
+    return frame
+
+
+def fitted(step, size):
+    # крок передобробки, навчений на іншому батчі - міряю лише transform нових рядків
+    step.fit(synthetic_bands(size, seed=1))
+    return step, synthetic_bands(size)
+
+
+def lab4_cases():
+    from power_query import TASKS
+    from bands_data import profile_missing, FfillImputer, MedianImputer, GroupImputer, Standardizer
+
+    cases = []
+    for name, query in TASKS.items():
+        cases += [
+            Case(f'{name}_pandas', synthetic_power, lambda data, q=query: q.run(data['frame'], backend='pandas')),
+            Case(f'{name}_numpy', synthetic_power, lambda data, q=query: q.run(data['columns'], backend='numpy')),
+            Case(f'{name}_chunked', synthetic_power, lambda data, q=query: q.run(data['columns'], backend='chunked')),
+        ]
+    cases.append(Case('fourth_means', fourth_task_input,
+                      lambda data: [float(np.mean(values)) for values in data['sample'].values()]))
+    for case in cases:
+        case.sizes = [100_000, 1_000_000]
+    cases += [
+        Case('profile_missing', synthetic_bands, profile_missing),
+        Case('ffill_imputer', synthetic_bands, lambda frame: FfillImputer().fit_transform(frame)),
+        Case('median_imputer', lambda size: fitted(MedianImputer(), size), lambda data: data[0].transform(data[1])),
+        Case('group_imputer', lambda size: fitted(GroupImputer('press_type'), size),
+             lambda data: data[0].transform(data[1])),
+        Case('standardizer', lambda size: fitted(Standardizer(prefix='std_'), size),
+             lambda data: data[0].transform(data[1])),
+    ]
+    for case in cases[-5:]:
+        case.sizes = [10_000, 1_000_000]
+    return cases
+
+
+############# lab3: dataframer та getData ###############
+
+_temp_dirs = []
+
+
+@atexit.register
+def _remove_temp_dirs():
+    for folder in _temp_dirs:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def synthetic_vhi_csv(province_ID, start_year, end_year, rng):
+    # формат відповіді NOAA: два рядки заголовка, дані у <tt><pre>, хвіст </pre></tt>
+    lines = [f"<br>Ukraine, Province:  {province_ID}: Synthetic,  Year: {start_year}-{end_year}, type=Mean<br>",
+             "year,week, SMN,SMT,VCI,TCI, VHI,"]
+    for year in range(start_year, end_year + 1):
+        for week in range(1, 53):
+            vhi = -1 if rng.random() < 0.02 else rng.uniform(5, 80)
+            lines.append(f"{year},{week:3d},{rng.uniform(0, 0.5):7.3f},{rng.uniform(250, 300):7.2f},"
+                         f"{rng.uniform(0, 100):7.2f},{rng.uniform(0, 100):7.2f},{vhi:7.2f},")
+    lines[2] = "<tt><pre>" + lines[2]
+    lines.append("</pre></tt>")
+    return "\n".join(lines) + "\n"
+
+
+def synthetic_vhi_folder(years):
+    # тимчасова тека з lab2_VHI/VHI-ID_<id>.csv для 27 областей за years років
+    root = tempfile.mkdtemp(prefix="bench_vhi_")
+    _temp_dirs.append(root)
+    folder = os.path.join(root, "lab2_VHI")
+    os.makedirs(folder)
+    rng = np.random.default_rng(26)
+    for province_ID in range(1, 28):
+        with open(os.path.join(folder, f"VHI-ID_{province_ID}.csv"), 'w', encoding='utf-8') as f:
+            f.write(synthetic_vhi_csv(province_ID, 2024 - years + 1, 2024, rng))
+    return root
+
+
+def in_folder(root, func):
+    # lab3 працює з відносною текою lab2_VHI
+    previous = os.getcwd()
+    os.chdir(root)
+    try:
+        return func()
+    finally:
+        os.chdir(previous)
+
+
+def vhi_cases():
+    import lab3
+    from vhi_store import VHIStore
+
+    app = lab3.Web_Analyzator()
+    params = {'data_type': 'VHI', 'province_id': '5', 'week_range': '1-52', 'year_range': 'All',
+              'color_map': 'YlGnBu'}
+
+    def get_data(root, cached):
+        if not cached:
+            app.frame_cache.clear()
+        return in_folder(root, lambda: app.getData(params))
+
+    cases = [
+        Case('dataframer', synthetic_vhi_folder, lambda root: lab3.dataframer(os.path.join(root, "lab2_VHI"))),
+        Case('store_build_csv', synthetic_vhi_folder,
+             lambda root: VHIStore(os.path.join(root, "lab2_VHI"), use_cache=False).refresh()),
+        Case('store_build_parquet', synthetic_vhi_folder,
+             lambda root: VHIStore(os.path.join(root, "lab2_VHI")).refresh()),
+        Case('getData', synthetic_vhi_folder, lambda root: get_data(root, cached=False)),
+        Case('getData_cached', synthetic_vhi_folder, lambda root: get_data(root, cached=True)),
+    ]
+    for case in cases:
+        case.sizes = [10, 43]
+    return cases
+
+
+############# lab5: фільтри сигналу ###############
+
+def noisy_harmonic(size, seed=26):
+    t = np.linspace(0, 10, size)
+    return np.sin(2 * np.pi * t) + np.random.default_rng(seed).normal(0, 0.3, size)
+
+
+def harmonic_with_time(size):
+    return np.linspace(0, 10, size), noisy_harmonic(size)
+
+
+def lab5_cases():
+    from signal_tools import gaussian_filter, uniform_filter, exponential_filter, make_stream, filter_chunks
+    from signal_pipeline import SignalPipeline, decimate_view
+    from signal_export import export_signal
+    from signal_sweep import signal_grid, filter_grid, sweep
+
+    def stream(y, filter_type, chunksize=4096):
+        chunks = (y[start:start + chunksize] for start in range(0, len(y), chunksize))
+        for _ in filter_chunks(chunks, make_stream(filter_type)):
+            pass
+
+    cases = [
+        Case('gaussian', noisy_harmonic, lambda y: gaussian_filter(y, 5, 2)),
+        Case('uniform', noisy_harmonic, lambda y: uniform_filter(y, 5)),
+        Case('exponential', noisy_harmonic, lambda y: exponential_filter(y, 0.6)),
+        Case('gaussian_window_1001', noisy_harmonic, lambda y: gaussian_filter(y, 1001, 150)),
+        Case('uniform_window_1001', noisy_harmonic, lambda y: uniform_filter(y, 1001)),
+        Case('gaussian_stream', noisy_harmonic, lambda y: stream(y, 'gaussian')),
+        Case('exponential_stream', noisy_harmonic, lambda y: stream(y, 'exponential')),
+        # рух слайдера фільтра: гармоніка та шум беруться з кешу конвеєра
+        Case('pipeline_filter_slider', lambda size: SignalPipeline(noisy_harmonic(size)),
+             lambda pipeline: [pipeline.compute(1.0, 1.0, 0.0, 0.0, 0.1, True, ('gaussian', window),
+                                                lambda y, window=window: gaussian_filter(y, window, 2))
+                               for window in (3, 5, 7, 9)]),
+    ]
+    for case in cases:
+        case.sizes = [1000, 100_000]
+    # проріджування для графіка: увесь сигнал на 750 пікселів
+    cases += [
+        Case('decimate_minmax', harmonic_with_time, lambda ty: decimate_view(*ty, None, 750),
+             sizes=[100_000, 1_000_000]),
+        Case('decimate_lttb', harmonic_with_time, lambda ty: decimate_view(*ty, None, 750, 'lttb'),
+             sizes=[100_000, 1_000_000]),
+    ]
+    # експорт трьох колонок сигналу; параметри - метадані
+    folder = tempfile.mkdtemp(prefix="bench_export_")
+    _temp_dirs.append(folder)
+    metadata = {'Amplitude': 1.0, 'Filter Type': 'Gaussian'}
+    for fmt in ('csv', 'npz'):
+        cases.append(Case(f'export_{fmt}', harmonic_with_time,
+                          lambda ty, fmt=fmt: export_signal(os.path.join(folder, f'signal.{fmt}'),
+                                                            {'Time': ty[0], 'Original Signal': ty[1],
+                                                             'Filtered Signal': ty[1]}, metadata),
+                          sizes=[100_000]))
+    # перебір: size сигналів x 20 налаштувань фільтрів
+    filters = filter_grid(gaussian_window=(5, 9, 13), gaussian_std=(1.0, 2.0, 4.0), uniform_window=(5, 9, 13, 21),
+                          alpha=(0.2, 0.4, 0.6))
+    cases.append(Case('sweep_20_filters', lambda size: signal_grid(amplitude=np.linspace(0.5, 5, size)),
+                      lambda signals: sweep(signals, filters, seed=26), sizes=[100, 1000]))
+    return cases
+
+
+############# lab6: регресія ###############
+
+def regression_input(size, seed=26):
+    # як у lab6.ipynb: y = 3x + 6 + шум
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(-10, 10, size)
+    return x, 3 * x + 6 + rng.normal(0, 3, size)
+
+
+def series_input(size, points=200):
+    # size рядів по points точок
+    return tuple(values.reshape(size, points) for values in regression_input(size * points))
+
+
+def lab6_cases():
+    from regression import least_squares_method_1, least_squares_method_2, gradient_descent, train_linear_gd, \
+        least_squares_batch, cross_validate_regression, cross_validate_ols
+
+    cases = [
+        Case('least_squares_1', regression_input, lambda xy: least_squares_method_1(*xy)),
+        Case('least_squares_2', regression_input, lambda xy: least_squares_method_2(*xy)),
+        Case('polyfit', regression_input, lambda xy: np.polyfit(*xy, 1)),
+        Case('gradient_descent_100', regression_input, lambda xy: gradient_descent(*xy, 0.001, 100)),
+        Case('train_linear_gd_10000', regression_input, lambda xy: train_linear_gd(*xy, 0.001, 10000, record_every=100)),
+        Case('train_linear_gd_sgd_1000', regression_input,
+             lambda xy: train_linear_gd(*xy, 0.01, 1000, batch_size=256, record_every=100, random_state=26)),
+        Case('cv_20_fold', regression_input, lambda xy: cross_validate_regression(*xy, cv=20)),
+        Case('cv_20_fold_ols', regression_input, lambda xy: cross_validate_ols(*xy, cv=20)),
+    ]
+    for case in cases:
+        case.sizes = [1000, 100_000]
+    cases.append(Case('least_squares_batch', series_input, lambda xy: least_squares_batch(*xy), sizes=[100, 10_000]))
+    return cases
+
+
+############# lab7: растри Sentinel/Landsat ###############
+
+def synthetic_scenes(size, bands=('B2', 'B3', 'B4', 'B8'), seed=26):
+    # дві сусідні сцени size x size (UTM 36N, 30 м) з перекриттям, як A/B у lab_7.ipynb
+    import rasterio
+    from rasterio.transform import from_origin
+
+    root = tempfile.mkdtemp(prefix="bench_raster_")
+    _temp_dirs.append(root)
+    rng = np.random.default_rng(seed)
+    rows, cols = np.mgrid[0:size, 0:size]
+    scenes = []
+    for name, (x0, y0) in zip('AB', [(300000, 5700000), (300000 + 0.8 * 30 * size, 5700000 - 0.2 * 30 * size)]):
+        scene = {}
+        for band in bands:
+            data = (30000 + 20000 * np.sin(cols / 150 + rng.random()) * np.cos(rows / 100)).astype(np.uint16)
+            path = os.path.join(root, f"{name}_{band}.tif")
+            with rasterio.open(path, 'w', driver='GTiff', width=size, height=size, count=1, dtype='uint16',
+                               crs='EPSG:32636', transform=from_origin(x0, y0, 30, 30), tiled=True) as dst:
+                dst.write(data, 1)
+            scene[band] = path
+        scenes.append(scene)
+    return {'root': root, 'scenes': scenes}
+
+
+def synthetic_pansharpen(size):
+    # еталон і "результат паншарпенінгу" (еталон + шум) - 4-канальні растри size x size
+    import rasterio
+
+    data = synthetic_scenes(size)
+    rng = np.random.default_rng(26)
+    paths = {}
+    for name in ('reference', 'predicted'):
+        paths[name] = os.path.join(data['root'], f"{name}.tif")
+        with rasterio.open(data['scenes'][0]['B2']) as src:
+            profile = {**src.profile, 'count': 4}
+        with rasterio.open(paths[name], 'w', **profile) as dst:
+            for band, path in enumerate(data['scenes'][0].values(), start=1):
+                with rasterio.open(path) as src:
+                    values = src.read(1)
+                if name == 'predicted':
+                    values = np.clip(values + rng.normal(0, 500, values.shape), 0, 65535).astype(np.uint16)
+                dst.write(values, band)
+    return paths
+
+
+def mosaic_output(size):
+    # готова мозаїка (тайлова, стиснена, з оглядами) для вимірювання переглядів
+    from raster_pipeline import mosaic
+
+    data = synthetic_scenes(size)
+    return mosaic(data['scenes'], os.path.join(data['root'], "mosaic.tif"))
+
+
+def synthetic_archives(size, seed=26):
+    # zip-архіви продуктів Landsat: 4 потрібні канали й 8 зайвих файлів по size КБ у кожному
+    import zipfile
+
+    root = tempfile.mkdtemp(prefix="bench_zip_")
+    _temp_dirs.append(root)
+    data_dir = os.path.join(root, "data")
+    os.makedirs(data_dir)
+    rng = np.random.default_rng(seed)
+    for scene in ('LC08_L1TP_182025_20190830_20190903_01_T1', 'LC08_L1TP_182026_20190830_20190903_01_T1'):
+        with zipfile.ZipFile(os.path.join(data_dir, scene + ".zip"), 'w', zipfile.ZIP_DEFLATED) as archive:
+            for band in range(1, 13):
+                payload = rng.integers(0, 64, size * 1024, dtype=np.uint8).tobytes()
+                archive.writestr(f"{scene}/{scene}_B{band}.TIF", payload)
+    return {'root': root, 'data_dir': data_dir}
+
+
+def extracted_archives(size):
+    # ті самі архіви, вже розпаковані один раз - для вимірювання повторного запуску
+    from archive_extract import extract_archives
+
+    data = synthetic_archives(size)
+    extract_archives(data['data_dir'], os.path.join(data['root'], "full_data"))
+    return data
+
+
+def lab7_cases():
+    import rasterio
+    from raster_pipeline import mosaic, read_preview
+    from pansharpen_eval import compare_rasters
+    from archive_extract import extract_archives
+
+    def read_full(path):
+        with rasterio.open(path) as src:
+            return src.read([1, 2, 3])
+
+    def run(data, name, **kwargs):
+        return mosaic(data['scenes'], os.path.join(data['root'], f"{name}.tif"), **kwargs)
+
+    cases = [
+        Case('mosaic', synthetic_scenes, lambda data: run(data, 'mosaic')),
+        Case('mosaic_uncompressed', synthetic_scenes,
+             lambda data: run(data, 'mosaic_uncompressed', compress=None, overviews=False)),
+        Case('mosaic_4326', synthetic_scenes, lambda data: run(data, 'mosaic_4326', dst_crs='EPSG:4326')),
+        Case('mosaic_4326_serial', synthetic_scenes,
+             lambda data: run(data, 'mosaic_4326_serial', dst_crs='EPSG:4326', n_jobs=1)),
+    ]
+    for case in cases:
+        case.sizes = [1024, 4096]
+    cases += [
+        Case('preview_full_read', mosaic_output, read_full, sizes=[4096]),
+        Case('preview_overview', mosaic_output, read_preview, sizes=[4096]),
+    ]
+    cases.append(Case('compare_rasters', synthetic_pansharpen,
+                      lambda paths: compare_rasters(paths['reference'], paths['predicted']).overall(),
+                      sizes=[1024, 4096]))
+    cases += [
+        # кожен виклик - у нову теку, тож це вартість першого розпакування
+        Case('extract_archives', synthetic_archives,
+             lambda data: extract_archives(data['data_dir'], tempfile.mkdtemp(dir=data['root'])), sizes=[1024]),
+        Case('extract_archives_cached', extracted_archives,
+             lambda data: extract_archives(data['data_dir'], os.path.join(data['root'], "full_data")), sizes=[1024]),
+    ]
+    return cases
+
+
+SUITES = {
+    'lab4': lab4_cases,
+    'vhi': vhi_cases,
+    'lab5': lab5_cases,
+    'lab6': lab6_cases,
+    'lab7': lab7_cases,
+}
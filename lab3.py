@@ -1,45 +1,22 @@
 import os
-import datetime
+import numpy as np
 import pandas as pd
 import seaborn as sns
-import urllib.request
-from spyre import server
+import cherrypy
+from spyre import server, model
 import matplotlib.pyplot as plt
+from vhi_cache import LRUCache
+from vhi_store import get_store, province_from_filename, parse_range
+from vhi_download import download_all, download_province
 
 ############# Функції з лаби 2 ###############
 
-def download_data(province_ID, start_year=1981, end_year=2024):
-    # перевіряю, чи існує папка для зберігання
-    if not os.path.exists("lab2_VHI"):
-        os.makedirs("lab2_VHI")
-    
-    # перевіряю, чи файл уже завантажений
-    filename_pattern = f"VHI-ID_{province_ID}_"
-    existing_files = [file for file in os.listdir("lab2_VHI") if file.startswith(filename_pattern)]
-    if existing_files:
-        print(f"=] Файл для VHI-ID №{province_ID} вже існує: {existing_files[0]}\n")
-        return
-    
-    # скачую
-    url_download = f"https://www.star.nesdis.noaa.gov/smcd/emb/vci/VH/get_TS_admin.php?country=UKR&provinceID={province_ID}&year1={start_year}&year2={end_year}&type=Mean"
-    vhi_url_open = urllib.request.urlopen(url_download)
-    
-    # створюю назви файлу з датою та часом
-    year_month_now = datetime.datetime.now().strftime("%d-%m-%Y")
-    h_m_s_time_now = datetime.datetime.now().strftime("%H-%M-%S")
-    filename = f"VHI-ID_{province_ID}_{year_month_now}_{h_m_s_time_now}.csv"
-    
-    file_path = os.path.join("lab2_VHI", filename)
-    with open(file_path, 'wb') as output:
-        output.write(vhi_url_open.read())
-
-    # виводжу відповідний текст
-    print()
-    print(f"=] VHI-файл {filename} завантажений успішно!")
-    print(f"=] Тека зберігання: {os.path.abspath(file_path)}")
-    print()
-
-    return
+def download_data(province_ID, start_year=1981, end_year=None):
+    # один файл VHI-ID_<id>.csv на область: наявний доповнюється новими тижнями, а не дублюється
+    os.makedirs("lab2_VHI", exist_ok=True)
+    file_path = download_province(province_ID, start_year, end_year, incremental=True)
+    print(f"=] VHI-файл для VHI-ID №{province_ID}: {os.path.abspath(file_path)}")
+    return file_path
 
 def dataframer(folder_path):
     fr, columns  = [], ["Year", "Week", "SMN", "SMT", "VCI", "TCI", "VHI", "empty"]
@@ -50,7 +27,7 @@ def dataframer(folder_path):
     # перебираю файли
     for file_name in csv_files:
         file_path = os.path.join(folder_path, file_name)
-        province_ID = int(file_name.split('_')[1])
+        province_ID = province_from_filename(file_name)
         
         # зчитую та обробляю CSV файли
         df = pd.read_csv(file_path, header=1, names=columns) # зчитую файл CSV у df
@@ -66,8 +43,8 @@ def dataframer(folder_path):
 
         fr.append(df) # додаю до списку
 
-    # об'єдную дані у фрейм, видаливши дублікати
-    df_res = pd.concat(fr).drop_duplicates().reset_index(drop=True)
+    # об'єдную дані у фрейм (одна область - один файл, тому дублікатів немає)
+    df_res = pd.concat(fr).reset_index(drop=True)
     # відкидаю області 12 та 20
     df_res = df_res.loc[(df_res.province_ID != 12) & (df_res.province_ID != 20)]
 
@@ -111,11 +88,6 @@ def change_province_id(df):
 
 ##############################################
 
-# скачую файли
-for index in range(1, 28):
-    print(f"!] Завантаження CSV-файлу за VHI-ID №{index}...")
-    download_data(index, 1981, 2024)
-
 # для сприйняття замість айді ставлю назви
 ids_with_names = {
     1: 'Вінницька', 2: 'Волинська', 3: 'Дніпропетровська', 
@@ -223,43 +195,59 @@ class Web_Analyzator(server.App):
             "control_id": "update_data"
         }
     ]
+
+    # кеші відфільтрованих фреймів і готових PNG (спільні для всіх користувачів)
+    frame_cache = LRUCache(maxsize=256)
+    plot_cache = LRUCache(maxsize=64)
+
+    # нормалізований ключ запиту: "1-52" і " 1 - 52" дають один і той самий ключ
+    def cache_key(self, params, *extra_keys):
+        province_id = params.get('province_id', None)
+        return (params['data_type'],
+                None if province_id is None else int(province_id),
+                parse_range(params['week_range']),
+                parse_range(params['year_range'])) + tuple(params[key] for key in extra_keys)
+
     # ф-ія для отримання дф та його обробки
     def getData(self, params):
         data_type = params['data_type'] # отримую значення індксів
         province_id = params.get('province_id', None) # отримую значення id області, якщо є, else встановлюємо None
-        folder_path = "lab2_VHI"
-        
-        # створюю датафрейм і міняю айді (лаба2)
-        df_old = dataframer(folder_path)
-        df = change_province_id(df_old)
 
-        week_range = params['week_range'].split('-') # отримую діапазон тижнів
-        
-        # в інти
-        start_week = int(week_range[0])
-        end_week = int(week_range[1])
-        
-        # залишаю лише рядки з тижнями в заданому діапазоні
-        df = df[(df['Week'] >= start_week) & (df['Week'] <= end_week)]
-        year_range = params['year_range'] # отримую діапазон років з параметрів
-        
-        # якщо заданий діапазон
-        if year_range.lower() != 'all':
-            # розділив на початковий і кінцевий
-            year_range = year_range.split('-')
-            start_year = int(year_range[0])
-            end_year = int(year_range[1])
-            df = df[(df['Year'] >= start_year) & (df['Year'] <= end_year)]
+        # дані беру зі сховища: CSV парсяться один раз, а не на кожен запит
+        # (айді областей вже змінені, як у change_province_id)
+        store = get_store("lab2_VHI")
+        store.refresh()
+
+        # залишаю лише рядки з тижнями/роками в заданому діапазоні та потрібну область
+        return self.frame_cache.get_or_set(
+            self.cache_key(params),
+            lambda: store.select(data_type, province_id, params['week_range'], params['year_range']),
+            version=store.version)
+
+    # PNG графіка з кешу; малюю фігуру лише при промаху
+    def getPlotPNG(self, params):
+        store = get_store("lab2_VHI")
+        store.refresh()
+        return self.plot_cache.get_or_set(
+            self.cache_key(params, 'color_map'),
+            lambda: model.Plot().getPlotPath(self.getPlot(params)).getvalue(),
+            version=store.version)
 
-        # якщо є id
-        if province_id is not None:
-            province_id = int(province_id) # в інт
-            df = df[df['province_ID'] == province_id]
+    # віддаю готові байти замість повторного savefig у spyre
+    def getRoot(self):
+        webapp = super().getRoot()
 
-        return df[['province_ID', 'Year', 'Week', data_type]]
+        @cherrypy.expose
+        def plot(**args):
+            png = self.getPlotPNG(webapp.clean_args(args))
+            cherrypy.response.headers['Content-Type'] = 'image/png'
+            return png
+
+        webapp.plot = plot
+        return webapp
     
     def getPlot(self, params):
-        df = self.getData(params) # отримую дф
+        cube = get_store("lab2_VHI").cube() # куб [область, рік, тиждень, індекс]
         data_type = params['data_type'] # отримую індекси
         province_id = int(params['province_id']) # отримую ID області в інт
         province_name = ids_with_names[province_id] # отримую назви області
@@ -279,17 +267,19 @@ class Web_Analyzator(server.App):
         # створюю фігуру
         plt.figure(figsize=(10, 15))
         plt.subplot(2, 1, 1) # перший сабплот
-        sns.heatmap(df.pivot(index='Year', columns='Week', values=data_type), cmap=params['color_map'],
-            cbar_kws={'label': data_type}, linewidths=.7) # хіт мап
+        sns.heatmap(cube.heatmap(province_id, data_type, params['year_range'], params['week_range']),
+            cmap=params['color_map'], cbar_kws={'label': data_type}, linewidths=.7) # хіт мап
         plt.title(f"Heatmap of {data_type} for province [{province_name}]\n{year_range}") # заголовок
         plt.xlabel("Week")  # назва осі X
         plt.ylabel("Year")  # назва осі Y
 
         plt.subplot(2, 1, 2) # другий сабплот
-        # лінійний графік
-        for year in df['Year'].unique():
-            data_year = df[df['Year'] == year]
-            plt.plot(data_year['Week'], data_year[data_type], marker='.', linestyle='-', label=year)
+        # лінійний графік: кожен рік - рядок куба, без фільтрації фрейму
+        years, weeks, values = cube.grid(province_id, data_type, params['year_range'], params['week_range'])
+        for year, data_year in zip(years, values):
+            has_data = ~np.isnan(data_year)
+            if has_data.any():
+                plt.plot(weeks[has_data], data_year[has_data], marker='.', linestyle='-', label=year)
 
         plt.title(f'Graph {data_type} for province [{province_name}]\n{year_range}') # заголовок
         plt.xlabel('Week')  # назва осі X
@@ -299,5 +289,16 @@ class Web_Analyzator(server.App):
         plt.tight_layout() # авто-вирівнювання та відступи між графіками
         return plt.gcf()
     
-app = Web_Analyzator()
-app.launch(port=6969)
\ No newline at end of file
+# запуск лише як скрипта - так модуль можна імпортувати (напр. для бенчмарків)
+if __name__ == "__main__":
+    # скачую файли паралельно; для вже наявних докачую лише нові тижні
+    print("!] Оновлення CSV-файлів за VHI-ID №1-27...")
+    for index, result in download_all(range(1, 28), 1981, incremental=True).items():
+        if isinstance(result, Exception):
+            print(f"=] Не вдалося завантажити VHI-ID №{index}: {result}")
+
+    # будую сховище один раз при старті
+    get_store("lab2_VHI").refresh()
+
+    app = Web_Analyzator()
+    app.launch(port=6969)
\ No newline at end of file
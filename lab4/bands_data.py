@@ -0,0 +1,294 @@
+import warnings
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+BANDS_FILE = "second_part_files/bands.data"
+BANDS_COLUMNS = [
+    'timestamp', 'cylinder_number', 'customer', 'job_number',
+    'grain_screened', 'ink_color', 'proof_on_ctd_ink', 'blade_mfg',
+    'cylinder_division', 'paper_type', 'ink_type', 'direct_steam',
+    'solvent_type', 'type_on_cylinder', 'press_type', 'press',
+    'unit_number', 'cylinder_size', 'paper_mill_location', 'plating_tank',
+    'proof_cut', 'viscosity', 'caliper', 'ink_temperature', 'humidity',
+    'roughness', 'blade_pressure', 'varnish_pct', 'press_speed',
+    'ink_pct', 'solvent_pct', 'esa_voltage', 'esa_amperage',
+    'wax', 'hardener', 'roller_durometer', 'current_density',
+    'anode_space_ratio', 'chrome_content', 'band_type']
+# скільки смуг рядків має карта пропусків - замість клітинки на кожен рядок
+PROFILE_BLOCKS = 64
+
+
+def read_bands(path=BANDS_FILE):
+    # датафрейм cylinder bands як data_framer у ноутбуці: '?' -> NaN
+    return pd.read_csv(path, sep=',', header=None, names=BANDS_COLUMNS, na_values='?')
+
+
+def numeric_columns(df):
+    return list(df.select_dtypes(include='number').columns)
+
+
+def profile_missing(df, n_blocks=PROFILE_BLOCKS):
+    """
+    Профіль пропусків за один прохід по df.isna().
+
+    Параметри:
+    n_blocks (int): На скільки смуг рядків стиснути карту пропусків.
+
+    Повертає:
+    (counts, blocks) - кількість пропусків по колонках (від найбільшої) і DataFrame
+    частки пропусків у кожній смузі рядків (індекс - перший рядок смуги) по колонках.
+    """
+    mask = df.isna().to_numpy()
+    counts = pd.Series(mask.sum(axis=0), index=df.columns).sort_values(ascending=False, kind='stable')
+
+    n_rows = len(mask)
+    starts = np.unique(np.linspace(0, n_rows, min(n_blocks, n_rows) + 1, dtype=np.int64)[:-1])
+    if n_rows == 0:
+        return counts, pd.DataFrame(columns=df.columns, dtype=np.float64)
+    sizes = np.diff(np.append(starts, n_rows))
+    fractions = np.add.reduceat(mask.astype(np.int32), starts, axis=0) / sizes[:, None]
+    return counts, pd.DataFrame(fractions, index=starts, columns=df.columns)
+
+
+def plot_missing(counts, blocks, title="Пропущені значення у датафреймі"):
+    # стовпчики кількості пропусків і стиснена карта замість sns.heatmap(df.isnull())
+    import matplotlib.pyplot as plt
+
+    fig, (ax_counts, ax_map) = plt.subplots(1, 2, figsize=(16, 6))
+    ax_counts.bar(counts.index.astype(str), counts.to_numpy())
+    ax_counts.tick_params(axis='x', labelrotation=90)
+    ax_counts.set_title("Кількість пропущених значень")
+    ax_counts.set_xlabel("Ознака")
+
+    image = ax_map.imshow(blocks.to_numpy(), aspect='auto', cmap='binary', vmin=0, vmax=1, interpolation='nearest')
+    ax_map.set_xticks(np.arange(len(blocks.columns)), blocks.columns.astype(str), rotation=90)
+    ax_map.set_yticks(np.arange(len(blocks))[::max(1, len(blocks) // 8)], blocks.index[::max(1, len(blocks) // 8)])
+    ax_map.set_title("Частка пропусків по смугах рядків")
+    ax_map.set_xlabel("Ознака")
+    ax_map.set_ylabel("Рядок")
+    fig.colorbar(image, ax=ax_map)
+    fig.suptitle(title)
+    return fig
+
+
+class Step(ABC):
+    """
+    Крок передобробки: fit запам'ятовує статистики, transform застосовує їх до
+    будь-якого батча (той самий датафрейм чи нові рядки) без повторного проходу по даних навчання.
+    Колонки за замовчуванням - числові колонки датафрейму з fit.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = columns
+        self.columns_ = None
+
+    def _fit_columns(self, df):
+        self.columns_ = list(self.columns) if self.columns is not None else numeric_columns(df)
+        return self.columns_
+
+    def _block(self, df):
+        # числові колонки одним 2-D масивом float64
+        return df[self.columns_].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    @abstractmethod
+    def fit(self, df):
+        ...
+
+    @abstractmethod
+    def transform(self, df):
+        ...
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+
+def _write_filled(df, columns, filled, mask):
+    # у копію пишу лише колонки, де справді були пропуски: решта зберігає свій тип
+    out = df.copy()
+    for j in np.flatnonzero(mask.any(axis=0)):
+        out[columns[j]] = filled[:, j]
+    return out
+
+
+def _ffill_index(mask):
+    # індекс останнього непропущеного рядка для кожної клітинки (0, якщо такого ще не було)
+    index = np.where(mask, 0, np.arange(len(mask))[:, None])
+    return np.maximum.accumulate(index, axis=0) if len(mask) else index
+
+
+class FfillImputer(Step):
+    """
+    Заповнення попереднім значенням (замість застарілого fillna(method='ffill')).
+    fit запам'ятовує останнє відоме значення кожної колонки - ним заповнюються
+    пропуски на початку наступного батча. transform після заповнення оновлює ці
+    значення, тож батчі, подані по черзі, заповнюються як один суцільний датафрейм.
+    fit_transform поводиться як df.ffill(). Колонки за замовчуванням - усі, не лише числові.
+    """
+
+    def _fit_columns(self, df):
+        self.columns_ = list(self.columns) if self.columns is not None else list(df.columns)
+        return self.columns_
+
+    def _fill(self, df, carry):
+        columns = self.columns_
+        mask = df[columns].isna().to_numpy()
+        index = _ffill_index(mask)
+        # рядки до першого значення в батчі - туди йде значення з попереднього батча
+        leading = np.logical_and.accumulate(mask, axis=0)
+        out = df.copy()
+        for j in np.flatnonzero(mask.any(axis=0)):
+            filled = df[columns[j]].to_numpy()[index[:, j]]
+            if carry is not None and not pd.isna(carry[j]):
+                filled = np.where(leading[:, j], carry[j], filled)
+            out[columns[j]] = filled
+        return out, mask
+
+    def fit(self, df):
+        self._fit_columns(df)
+        self._store_last(df, df[self.columns_].isna().to_numpy())
+        return self
+
+    def _store_last(self, df, mask):
+        self.last_ = np.empty(len(self.columns_), dtype=object)
+        for j, col in enumerate(self.columns_):
+            valid = np.flatnonzero(~mask[:, j])
+            self.last_[j] = df[col].iloc[valid[-1]] if len(valid) else np.nan
+
+    def transform(self, df):
+        out, _ = self._fill(df, self.last_)
+        # останні значення вже з урахуванням перенесених: колонка без жодного значення в батчі їх зберігає
+        self._store_last(out, out[self.columns_].isna().to_numpy())
+        return out
+
+    def fit_transform(self, df):
+        self._fit_columns(df)
+        out, mask = self._fill(df, None)
+        self._store_last(df, mask)
+        return out
+
+
+class MedianImputer(Step):
+    # пропуски числових колонок -> медіана колонки з fit
+    def fit(self, df):
+        self._fit_columns(df)
+        block = self._block(df)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            self.medians_ = np.nanmedian(block, axis=0) if len(block) else np.full(block.shape[1], np.nan)
+        return self
+
+    def transform(self, df):
+        block = self._block(df)
+        mask = np.isnan(block)
+        return _write_filled(df, self.columns_, np.where(mask, self.medians_, block), mask)
+
+
+class GroupImputer(Step):
+    """
+    Пропуски числових колонок -> статистика своєї групи (напр. медіана по press_type).
+    Групи, яких не було у fit, і групи без жодного значення колонки отримують загальну статистику.
+
+    Параметри:
+    by (str або list): Колонка(и) групування.
+    stat (str): 'median' або 'mean'.
+    """
+
+    def __init__(self, by, stat='median', columns=None):
+        super().__init__(columns)
+        self.by = [by] if isinstance(by, str) else list(by)
+        self.stat = stat
+
+    def _fit_columns(self, df):
+        columns = super()._fit_columns(df)
+        self.columns_ = [col for col in columns if col not in self.by]
+        return self.columns_
+
+    def _group_keys(self, df):
+        if len(self.by) == 1:
+            return pd.Index(df[self.by[0]])
+        return pd.MultiIndex.from_frame(df[self.by])
+
+    def fit(self, df):
+        self._fit_columns(df)
+        table = df.groupby(self.by, dropna=True, sort=False)[self.columns_].agg(self.stat)
+        overall = df[self.columns_].agg(self.stat).to_numpy(dtype=np.float64)
+        values = table.to_numpy(dtype=np.float64, na_value=np.nan)
+        # рядок -1 (невідома група) - загальна статистика; порожні групи теж беруть її
+        self.overall_ = overall
+        self.groups_ = table.index
+        self.values_ = np.vstack([np.where(np.isnan(values), overall, values), overall])
+        return self
+
+    def transform(self, df):
+        block = self._block(df)
+        mask = np.isnan(block)
+        codes = self.groups_.get_indexer(self._group_keys(df))
+        return _write_filled(df, self.columns_, np.where(mask, self.values_[codes], block), mask)
+
+
+class _Scaler(Step):
+    """
+    Масштабування (x - shift) / scale одним 2-D масивом. Результат пишеться в копію:
+    з prefix - як нові колонки prefix + назва, без нього - замість початкових.
+    Колонка з нульовим розкидом лишається без ділення (scale = 1).
+    """
+
+    def __init__(self, columns=None, prefix=None):
+        super().__init__(columns)
+        self.prefix = prefix
+
+    def transform(self, df):
+        scaled = (self._block(df) - self.shift_) / self.scale_
+        names = [f"{self.prefix}{col}" for col in self.columns_] if self.prefix else self.columns_
+        out = df.copy()
+        out[names] = scaled
+        return out
+
+    def _set_scale(self, shift, scale):
+        self.shift_ = shift
+        self.scale_ = np.where((scale == 0) | np.isnan(scale), 1.0, scale)
+        return self
+
+
+class Normalizer(_Scaler):
+    # (x - min) / (max - min), як normalize_data у ноутбуці
+    def fit(self, df):
+        self._fit_columns(df)
+        block = self._block(df)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            low, high = np.nanmin(block, axis=0), np.nanmax(block, axis=0)
+        return self._set_scale(low, high - low)
+
+
+class Standardizer(_Scaler):
+    # (x - mean) / std з ddof=1, як standardize_data (pandas .std()) у ноутбуці
+    def fit(self, df):
+        self._fit_columns(df)
+        block = self._block(df)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return self._set_scale(np.nanmean(block, axis=0), np.nanstd(block, axis=0, ddof=1))
+
+
+class Steps(Step):
+    # послідовність кроків: кожен навчається на виході попереднього
+    def __init__(self, *steps):
+        super().__init__()
+        self.steps = steps
+
+    def fit(self, df):
+        self.fit_transform(df)
+        return self
+
+    def transform(self, df):
+        for step in self.steps:
+            df = step.transform(df)
+        return df
+
+    def fit_transform(self, df):
+        for step in self.steps:
+            df = step.fit_transform(df)
+        return df
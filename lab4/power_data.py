@@ -0,0 +1,110 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+POWER_FILE = "first_part_files/household_power_consumption.txt"
+NUMERIC_COLUMNS = ['Global_active_power', 'Global_reactive_power', 'Voltage',
+                   'Global_intensity', 'Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+
+# Date і Time читаю як категорії: унікальних дат/часів ~1.5 тис. на 2 млн рядків,
+# тому парсити треба лише їх, а не склеєний рядок для кожного запису
+READ_DTYPES = {'Date': 'category', 'Time': 'category', **{col: np.float32 for col in NUMERIC_COLUMNS}}
+
+
+def epoch_seconds(date, time):
+    """
+    Date ('16/12/2006') і Time ('17:24:00') у вигляді категорій -> int64 секунди від епохи.
+    Парсяться лише унікальні значення, далі - індексація за кодами категорій.
+    """
+    dates = pd.to_datetime(date.cat.categories, format='%d/%m/%Y').to_numpy().astype('datetime64[s]').astype(np.int64)
+    times = pd.to_timedelta(time.cat.categories).to_numpy().astype('timedelta64[s]').astype(np.int64)
+    return dates[date.cat.codes.to_numpy()] + times[time.cat.codes.to_numpy()]
+
+
+def _to_typed(chunk, dropna):
+    if dropna:
+        chunk = chunk.dropna()
+    columns = {'timestamp': epoch_seconds(chunk['Date'], chunk['Time'])}
+    columns.update({col: chunk[col].to_numpy() for col in NUMERIC_COLUMNS})
+    return pd.DataFrame(columns)
+
+
+def iter_power_chunks(path=POWER_FILE, chunksize=250_000, dropna=True):
+    """
+    Генератор шматків датасету: timestamp (int64, секунди) + числові колонки float32.
+    '?' читається як NaN; з dropna=True такі рядки відкидаються (як у first_pd_df_creator).
+    """
+    reader = pd.read_csv(path, sep=';', na_values=['?'], dtype=READ_DTYPES, chunksize=chunksize)
+    for chunk in reader:
+        yield _to_typed(chunk, dropna)
+
+
+def load_power(path=POWER_FILE, chunksize=250_000, dropna=True):
+    """
+    Весь датасет одним фреймом, але зібраним з типізованих шматків -
+    пікова пам'ять не містить object-колонок і склеєних рядків дати.
+    """
+    chunks = list(iter_power_chunks(path, chunksize, dropna))
+    if not chunks:
+        return _to_typed(pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in READ_DTYPES.items()}), dropna)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def hour_of_day(timestamp):
+    # година з int64 секунд (дані без часового поясу)
+    return (timestamp // 3600) % 24
+
+
+def write_column_store(out_dir, path=POWER_FILE, chunksize=250_000, dropna=True):
+    """
+    Конвертує датасет у теку з окремим сирим бінарним файлом на колонку
+    (<колонка>.bin) та meta.json з типами і кількістю рядків.
+    Пишеться потоково по шматках, тому весь датасет у пам'ять не завантажується.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    meta_path = os.path.join(out_dir, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    dtypes = {'timestamp': np.dtype(np.int64), **{col: np.dtype(np.float32) for col in NUMERIC_COLUMNS}}
+    files = {col: open(os.path.join(out_dir, f"{col}.bin.part"), 'wb') for col in dtypes}
+    rows = 0
+    try:
+        for chunk in iter_power_chunks(path, chunksize, dropna):
+            for col, dtype in dtypes.items():
+                np.ascontiguousarray(chunk[col].to_numpy(), dtype=dtype).tofile(files[col])
+            rows += len(chunk)
+    finally:
+        for f in files.values():
+            f.close()
+
+    for col in dtypes:
+        os.replace(os.path.join(out_dir, f"{col}.bin.part"), os.path.join(out_dir, f"{col}.bin"))
+    # meta.json пишу останнім - без нього сховище вважається незавершеним
+    meta = {'rows': rows, 'columns': {col: dtype.str for col, dtype in dtypes.items()}}
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    return out_dir
+
+
+def open_column_store(store_dir):
+    """
+    Відкриває колонки через np.memmap (лише читання): старт миттєвий, сторінки
+    файлів спільні для всіх процесів, кожна колонка - суцільний масив свого типу.
+
+    Повертає:
+    Словник {назва колонки: np.memmap}.
+    """
+    with open(os.path.join(store_dir, "meta.json"), encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta['rows'] == 0:
+        # порожній файл не можна відобразити у пам'ять
+        return {col: np.empty(0, dtype=np.dtype(dtype)) for col, dtype in meta['columns'].items()}
+    return {col: np.memmap(os.path.join(store_dir, f"{col}.bin"), dtype=np.dtype(dtype), mode='r', shape=(meta['rows'],))
+            for col, dtype in meta['columns'].items()}
+
+
+def take_rows(columns, index):
+    # вибірка рядків (маска або індекси) з усіх колонок
+    return {col: values[index] for col, values in columns.items()}
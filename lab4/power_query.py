@@ -0,0 +1,234 @@
+import operator
+import numpy as np
+import pandas as pd
+
+from power_data import hour_of_day
+
+DEFAULT_CHUNKSIZE = 1 << 16
+# np.logical_* з Logical -> оператори pandas для backend='pandas'
+PANDAS_LOGICAL = {np.logical_and: operator.and_, np.logical_or: operator.or_}
+
+
+class Expr:
+    """Вузол предикату: колонка, константа, порівняння або логічна комбінація."""
+
+    def __and__(self, other):
+        return Logical(np.logical_and, self, other)
+
+    def __or__(self, other):
+        return Logical(np.logical_or, self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+    def _compare(self, op, other):
+        return Compare(op, self, other if isinstance(other, Expr) else Const(other))
+
+    def __gt__(self, other):
+        return self._compare(operator.gt, other)
+
+    def __ge__(self, other):
+        return self._compare(operator.ge, other)
+
+    def __lt__(self, other):
+        return self._compare(operator.lt, other)
+
+    def __le__(self, other):
+        return self._compare(operator.le, other)
+
+    def __eq__(self, other):
+        return self._compare(operator.eq, other)
+
+    def __ne__(self, other):
+        return self._compare(operator.ne, other)
+
+    __hash__ = object.__hash__
+
+
+class Col(Expr):
+    def __init__(self, name):
+        self.name = name
+
+    def evaluate(self, columns, start, stop):
+        return column_slice(columns, self.name, start, stop)
+
+    def evaluate_frame(self, frame):
+        return column_series(frame, self.name)
+
+    def __repr__(self):
+        return f"Col({self.name!r})"
+
+
+class Const(Expr):
+    def __init__(self, value):
+        self.value = value
+
+    def evaluate(self, columns, start, stop):
+        return self.value
+
+    def evaluate_frame(self, frame):
+        return self.value
+
+    def __repr__(self):
+        return repr(self.value)
+
+
+class Compare(Expr):
+    def __init__(self, op, left, right):
+        self.op, self.left, self.right = op, left, right
+
+    def evaluate(self, columns, start, stop):
+        return self.op(self.left.evaluate(columns, start, stop), self.right.evaluate(columns, start, stop))
+
+    def evaluate_frame(self, frame):
+        return self.op(self.left.evaluate_frame(frame), self.right.evaluate_frame(frame))
+
+    def __repr__(self):
+        return f"({self.left!r} {self.op.__name__} {self.right!r})"
+
+
+class Logical(Expr):
+    def __init__(self, op, left, right):
+        self.op, self.left, self.right = op, left, right
+
+    def evaluate(self, columns, start, stop):
+        mask = self.left.evaluate(columns, start, stop)
+        other = self.right.evaluate(columns, start, stop)
+        # комбіную на місці, щоб не створювати ще одну маску на кожну умову
+        if isinstance(mask, np.ndarray) and mask.dtype == bool and mask.flags.owndata and mask.shape == np.shape(other):
+            return self.op(mask, other, out=mask)
+        return self.op(mask, other)
+
+    def evaluate_frame(self, frame):
+        # логічні операції pandas над булевими Series (вирівнювання за індексом фрейму)
+        return PANDAS_LOGICAL[self.op](self.left.evaluate_frame(frame), self.right.evaluate_frame(frame))
+
+    def __repr__(self):
+        return f"({self.left!r} {self.op.__name__} {self.right!r})"
+
+
+class Not(Expr):
+    def __init__(self, inner):
+        self.inner = inner
+
+    def evaluate(self, columns, start, stop):
+        return ~self.inner.evaluate(columns, start, stop)
+
+    def evaluate_frame(self, frame):
+        return ~self.inner.evaluate_frame(frame)
+
+
+def column_slice(columns, name, start, stop):
+    """
+    Значення колонки у рядках [start, stop) як numpy-масив (для numpy/memmap - view).
+    'hour' - похідна колонка з timestamp (або datetime у фреймі з first_pd_df).
+    """
+    if name == 'hour' and 'hour' not in columns:
+        if 'timestamp' in columns:
+            return hour_of_day(column_slice(columns, 'timestamp', start, stop))
+        return pd.DatetimeIndex(column_slice(columns, 'datetime', start, stop)).hour.to_numpy()
+
+    values = columns[name]
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    return values[start:stop]
+
+
+def column_series(frame, name):
+    # колонка фрейму як pandas.Series; 'hour' - через .dt.hour або з timestamp
+    if name == 'hour' and 'hour' not in frame:
+        if 'timestamp' in frame:
+            return hour_of_day(frame['timestamp'])
+        return frame['datetime'].dt.hour
+    return frame[name]
+
+
+def n_rows(columns):
+    if isinstance(columns, pd.DataFrame):
+        return len(columns)
+    return len(next(iter(columns.values())))
+
+
+def every_nth_halves(first_step, second_step):
+    # кожен first_step-й з першої половини та кожен second_step-й з другої
+    def select(indices):
+        half = len(indices) // 2
+        return np.concatenate((indices[:half][::first_step], indices[half:][::second_step]))
+    return select
+
+
+class Query:
+    """
+    Декларативний запит: предикат where і необов'язковий крок post над
+    знайденими індексами рядків (напр. every_nth_halves для task 5).
+    """
+
+    def __init__(self, where, post=None):
+        self.where = where
+        self.post = post
+
+    def indices(self, columns, backend='numpy', chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Індекси рядків, що задовольняють запит.
+
+        backend:
+        'numpy' - одна комбінована маска (numpy-масиви) на весь датасет;
+        'pandas' - булева pandas.Series, обчислена операціями над колонками фрейму
+        (словник колонок обгортається в DataFrame);
+        'chunked' - один прохід шматками по chunksize рядків, тимчасові маски
+        мають розмір шматка, а не N рядків.
+        """
+        total = n_rows(columns)
+        if backend == 'numpy':
+            mask = np.broadcast_to(self.where.evaluate(columns, 0, total), (total,))
+            found = np.flatnonzero(mask)
+        elif backend == 'pandas':
+            frame = columns if isinstance(columns, pd.DataFrame) else pd.DataFrame(columns, copy=False)
+            mask = self.where.evaluate_frame(frame)
+            if isinstance(mask, pd.Series):
+                mask = mask.to_numpy(dtype=bool)
+            found = np.flatnonzero(np.broadcast_to(mask, (total,)))
+        elif backend == 'chunked':
+            parts = []
+            for start in range(0, total, chunksize):
+                stop = min(start + chunksize, total)
+                mask = np.broadcast_to(self.where.evaluate(columns, start, stop), (stop - start,))
+                parts.append(np.flatnonzero(mask) + start)
+            found = np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+        else:
+            raise ValueError(f"Невідомий backend: {backend!r}")
+
+        return self.post(found) if self.post is not None else found
+
+    def run(self, columns, backend='numpy', chunksize=DEFAULT_CHUNKSIZE):
+        """Вибрані рядки у тому ж вигляді, що й вхід (DataFrame або словник колонок)."""
+        found = self.indices(columns, backend, chunksize)
+        if isinstance(columns, pd.DataFrame):
+            return columns.iloc[found]
+        return {col: values[found] for col, values in columns.items()}
+
+    def run_chunks(self, chunks):
+        """
+        Запит над потоком шматків (напр. iter_power_chunks) - для даних, більших за пам'ять.
+        post застосовується до вже зібраного результату.
+        """
+        selected = []
+        for chunk in chunks:
+            selected.append(Query(self.where).run(chunk))
+        if not selected:
+            return pd.DataFrame()
+        result = pd.concat(selected, ignore_index=True)
+        return result.iloc[self.post(np.arange(len(result)))] if self.post is not None else result
+
+
+# задачі з lab_4.ipynb у вигляді запитів
+TASKS = {
+    'first': Query(Col('Global_active_power') > 5),
+    'second': Query(Col('Voltage') > 235),
+    'third': Query((Col('Global_intensity') >= 19) & (Col('Global_intensity') <= 20)
+                   & (Col('Sub_metering_2') > Col('Sub_metering_3'))),
+    'fifth': Query((Col('hour') >= 18) & (Col('Global_active_power') > 6)
+                   & (Col('Sub_metering_2') > Col('Sub_metering_1'))
+                   & (Col('Sub_metering_2') > Col('Sub_metering_3')),
+                   post=every_nth_halves(3, 4)),
+}
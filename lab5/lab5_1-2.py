@@ -1,10 +1,11 @@
 import os
-import csv
 import webbrowser
 import numpy as np
-from scipy import signal
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider, Button, CheckButtons, RadioButtons
+from signal_tools import gaussian_filter, uniform_filter
+from signal_pipeline import SignalPipeline, signal_settings, decimate_view
+from signal_export import export_format, export_in_background
 
 # початкові параметри
 INIT_AMPLITUDE = 1.0
@@ -13,17 +14,28 @@ INIT_PHASE = 0.0
 INIT_NOISE_MEAN = 0.0
 INIT_NOISE_DISPERSION = 0.1
 SHOW_NOISE = True
-BASE_NOISE = np.random.normal(0, 1, 1000)
+FRAME_MS = 16 # не частіше одного перерахування за кадр
+
+# довжина сигналу: python lab5_1-2.py --samples 1000000 --rate 1000
+N_SAMPLES, SAMPLE_RATE = signal_settings()
+DURATION = N_SAMPLES / SAMPLE_RATE
+BASE_NOISE = np.random.normal(0, 1, N_SAMPLES)
+# формат "Зберегти": --export-format csv|npz|parquet
+EXPORT_FORMAT = export_format()
+
+# кешує вісь часу, гармоніку та шум між оновленнями
+pipeline = SignalPipeline(BASE_NOISE, DURATION)
 
 # ф-ія для створення нового шуму
 def generate_new_noise(event):
     global BASE_NOISE
-    BASE_NOISE = np.random.normal(0, 1, 1000)
+    BASE_NOISE = np.random.normal(0, 1, N_SAMPLES)
+    pipeline.set_noise(BASE_NOISE)
     update(None)
 
 # ф-ія для генерації гармоніки з шумом
 def harmonic_with_noise(amplitude, frequency, phase, noise_mean, noise_dispersion, SHOW_NOISE=True):
-    t = np.linspace(0, 10, 1000)
+    t = np.linspace(0, DURATION, N_SAMPLES)
     y = amplitude * np.sin(2 * np.pi * frequency * t + phase)
 
     if SHOW_NOISE:
@@ -37,11 +49,9 @@ def filter_signal(y, filter_type='None', sigma=None, window_size=None):
     if filter_type == 'None':
         filtered_y = y
     elif filter_type == 'Gaussian':
-        window = signal.windows.gaussian(window_size, std=sigma)
-        filtered_y = signal.convolve(y, window / window.sum(), mode='same')
+        filtered_y = gaussian_filter(y, window_size, sigma)
     elif filter_type == 'Uniform':
-        window = np.ones(window_size) / window_size
-        filtered_y = signal.convolve(y, window, mode='same')
+        filtered_y = uniform_filter(y, window_size)
     return filtered_y
 
 # нове вікно
@@ -52,8 +62,27 @@ plt.subplots_adjust(bottom=0.6, hspace=0.9)
 t, y = harmonic_with_noise(INIT_AMPLITUDE, INIT_FREQUENCY, INIT_PHASE, INIT_NOISE_MEAN, INIT_NOISE_DISPERSION, SHOW_NOISE)
 filtered_y = filter_signal(y, 'None')
 
-line1, = ax1.plot(t, y, lw=2, color='b', label='Оригінальний сигнал')
-line2, = ax2.plot(t, filtered_y, lw=2, color='g', label='Відфільтрований сигнал')
+# на графіку - проріджена копія (min/max на піксель), повні дані - для експорту
+def axis_width(ax):
+    return ax.get_window_extent().width
+
+line1, = ax1.plot(*decimate_view(t, y, None, axis_width(ax1)), lw=2, color='b', label='Оригінальний сигнал')
+line2, = ax2.plot(*decimate_view(t, filtered_y, None, axis_width(ax2)), lw=2, color='g', label='Відфільтрований сигнал')
+
+# повні масиви, з яких малюється кожна лінія
+full_data = {line1: (t, y), line2: (t, filtered_y)}
+
+def draw_view(line, ax):
+    line_t, line_y = full_data[line]
+    line.set_data(*decimate_view(line_t, line_y, ax.get_xlim(), axis_width(ax)))
+
+# при зумі/панорамуванні видима частина малюється детальніше
+def on_xlim_changed(ax):
+    draw_view(line1 if ax is ax1 else line2, ax)
+    fig.canvas.draw_idle()
+
+ax1.callbacks.connect('xlim_changed', on_xlim_changed)
+ax2.callbacks.connect('xlim_changed', on_xlim_changed)
 
 ax1.set_xlabel('Час (с)')
 ax1.set_ylabel('Амплітуда')
@@ -63,8 +92,8 @@ ax2.set_xlabel('Час (с)')
 ax2.set_ylabel('Амплітуда')
 ax2.set_title('Відфільтрована гармоніка')
 
-# ф-ія для експорту даних у csv-файл
-def export_data(filename='data_export_matplotib.csv'):
+# ф-ія для експорту даних (csv/npz/parquet) - запис іде у фоновому потоці
+def export_data(filename=f'data_export_matplotib.{EXPORT_FORMAT}'):
     global t, y, filtered_y
     t, y = harmonic_with_noise(amp_slider.val, freq_slider.val, phase_slider.val, noise_mean_slider.val, 
                                noise_dispersion_slider.val, checkbox.get_status()[0])
@@ -80,20 +109,15 @@ def export_data(filename='data_export_matplotib.csv'):
     sigma = sigma_slider.val
     window_size = int(window_size_slider.val)
 
-    header = ["Time", "Original Signal", "Filtered Signal", "Amplitude",
-              "Frequency", "Phase", "Noise Mean", "Noise Covariance",
-              "Show Noise", "Filter Type", "Gaussian STD", "Window Size"]
-    data = np.column_stack((t, y, filtered_y, [amplitude] * len(t), [frequency] * len(t), [phase] * len(t), 
-                            [noise_mean] * len(t), [noise_dispersion] * len(t), 
-                            [show_noise] * len(t), [filter_type] * len(t), 
-                            [sigma] * len(t), [window_size] * len(t)))
-
-    with open(filename, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(data)
+    # параметри однакові для всіх відліків - пишуться один раз як метадані
+    metadata = {"Amplitude": amplitude, "Frequency": frequency, "Phase": phase,
+                "Noise Mean": noise_mean, "Noise Covariance": noise_dispersion,
+                "Show Noise": show_noise, "Filter Type": filter_type,
+                "Gaussian STD": sigma, "Window Size": window_size}
+    columns = {"Time": t, "Original Signal": y, "Filtered Signal": filtered_y}
 
-    print(f'Результати успішно збережено у файл: {os.path.abspath(filename)}')
+    return export_in_background(filename, columns, metadata, on_done=lambda path:
+                                print(f'Результати успішно збережено у файл: {path}'))
 
 # ф-ія для експорту графіків у PDF
 def export_to_pdf(filename='plot.pdf'):
@@ -160,6 +184,9 @@ export_button = Button(ax_export_button, 'Зберегти (PDF)')
 
 # ф-ія оновлення графіка
 def update(val):
+    global update_pending
+    update_pending = False
+
     amplitude = amp_slider.val
     frequency = freq_slider.val
     phase = phase_slider.val
@@ -171,11 +198,17 @@ def update(val):
     sigma = sigma_slider.val if filter_type == 'Gaussian' else None
     window_size = int(window_size_slider.val) if filter_type in ['Gaussian', 'Uniform'] else None
 
-    t, y = harmonic_with_noise(amplitude, frequency, phase, noise_mean, noise_dispersion, show_noise)
-    filtered_y = filter_signal(y, filter_type, sigma, window_size)
+    # перераховую лише стадії, чиї параметри змінились
+    t, y, filtered_y, changed = pipeline.compute(
+        amplitude, frequency, phase, noise_mean, noise_dispersion, show_noise,
+        (filter_type, sigma, window_size), lambda y: filter_signal(y, filter_type, sigma, window_size))
 
-    line1.set_data(t, y)
-    line2.set_data(t, filtered_y)
+    if 'y' in changed:
+        full_data[line1] = (t, y)
+        draw_view(line1, ax1)
+    if 'filtered' in changed:
+        full_data[line2] = (t, filtered_y)
+        draw_view(line2, ax2)
 
     ax1.set_title(f'Гармоніка з накладеним шумом (A={amplitude:.2f}, f={frequency:.2f}, φ={phase:.2f})')
 
@@ -185,6 +218,18 @@ def update(val):
         ax2.set_title(f'Відфільтрована гармоніка (тип={filter_type})')
     fig.canvas.draw_idle()
 
+# серія подій від слайдерів за один кадр -> одне оновлення (таймер одноразовий)
+update_pending = False
+update_timer = fig.canvas.new_timer(interval=FRAME_MS)
+update_timer.single_shot = True
+update_timer.add_callback(update, None)
+
+def schedule_update(val):
+    global update_pending
+    if not update_pending:
+        update_pending = True
+        update_timer.start()
+
 # ф-ія reset
 def reset(event):
     amp_slider.reset()
@@ -206,15 +251,15 @@ def export_plot(event):
     export_to_pdf()
 
 # слайдери/кнопоки до ф-ій update, reset, save_signal та export_plot
-amp_slider.on_changed(update)
-freq_slider.on_changed(update)
-phase_slider.on_changed(update)
-noise_mean_slider.on_changed(update)
-noise_dispersion_slider.on_changed(update)
-checkbox.on_clicked(update)
-filter_type_buttons.on_clicked(update)
-sigma_slider.on_changed(update)
-window_size_slider.on_changed(update)
+amp_slider.on_changed(schedule_update)
+freq_slider.on_changed(schedule_update)
+phase_slider.on_changed(schedule_update)
+noise_mean_slider.on_changed(schedule_update)
+noise_dispersion_slider.on_changed(schedule_update)
+checkbox.on_clicked(schedule_update)
+filter_type_buttons.on_clicked(schedule_update)
+sigma_slider.on_changed(schedule_update)
+window_size_slider.on_changed(schedule_update)
 new_noise_button.on_clicked(generate_new_noise)
 reset_button.on_clicked(reset)
 save_button.on_clicked(save_signal)
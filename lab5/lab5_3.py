@@ -1,8 +1,9 @@
-import os
-import csv
+import sys
 import subprocess
 import numpy as np
-from scipy import signal
+from signal_tools import gaussian_filter, uniform_filter, exponential_filter
+from signal_pipeline import SignalPipeline, signal_settings, decimate_view, visible_slice
+from signal_export import export_format, export_in_background
 from bokeh.plotting import figure, curdoc
 from bokeh.layouts import column, row, gridplot
 from bokeh.palettes import Plasma256 as palette
@@ -15,18 +16,29 @@ INIT_PHASE = 0.0
 INIT_NOISE_MEAN = 0.0
 INIT_NOISE_DISPERSION = 0.1
 SHOW_NOISE = True
-BASE_NOISE = np.random.normal(0, 1, 1000)
+FRAME_MS = 16 # не частіше одного перерахування за кадр
+
+# довжина сигналу: bokeh serve lab5_3.py --args --samples 1000000 --rate 1000
+N_SAMPLES, SAMPLE_RATE = signal_settings()
+DURATION = N_SAMPLES / SAMPLE_RATE
+BASE_NOISE = np.random.normal(0, 1, N_SAMPLES)
+# формат "Експорт даних": --export-format csv|npz|parquet
+EXPORT_FORMAT = export_format()
+
+# кешує вісь часу, гармоніку та шум між оновленнями
+pipeline = SignalPipeline(BASE_NOISE, DURATION)
 
 
 # ф-ія і кнопка "Новий шум"
 def generate_new_noise():
     global BASE_NOISE
-    BASE_NOISE = np.random.normal(0, 1, 1000)
+    BASE_NOISE = np.random.normal(0, 1, N_SAMPLES)
+    pipeline.set_noise(BASE_NOISE)
     update(None, None, None)
 
 # ф-ія для генерації гармоніки з шумом
 def harmonic_with_noise(amplitude, frequency, phase, noise_mean, noise_dispersion, show_noise=True):
-    t = np.linspace(0, 10, 1000)
+    t = np.linspace(0, DURATION, N_SAMPLES)
     y = amplitude * np.sin(2 * np.pi * frequency * t + phase)
 
     if show_noise:
@@ -38,25 +50,14 @@ def harmonic_with_noise(amplitude, frequency, phase, noise_mean, noise_dispersio
 # фільтрація сигналу
 def filter_signal(y, filter_type, gaussian_std=2, gaussian_window=5, uniform_window=5, alpha=0.6):
     if filter_type == "gaussian":
-        window = signal.windows.gaussian(gaussian_window, std=gaussian_std)
-        filtered_y = signal.convolve(y, window / window.sum(), mode='same')
+        filtered_y = gaussian_filter(y, gaussian_window, gaussian_std)
     elif filter_type == "uniform":
-        filtered_y = np.convolve(y, np.ones(uniform_window) / uniform_window, mode='same')
+        filtered_y = uniform_filter(y, uniform_window)
     elif filter_type == "exponential":
         filtered_y = exponential_filter(y, alpha=alpha)
 
     return filtered_y
 
-# експоненційний фільтр
-def exponential_filter(y, alpha=0.6):
-    filtered_y = np.zeros_like(y)
-    filtered_y[0] = y[0]  # Перше значення не фільтруємо
-    
-    for i in range(1, len(y)):
-        filtered_y[i] = alpha * y[i] + (1 - alpha) * filtered_y[i-1]
-        
-    return filtered_y
-
 # ф-ія для задання стилізованих графіків
 def set_plot_properties(plot, title, width, height):
     plot.title.text_font_size = "16pt"
@@ -75,12 +76,15 @@ slider_styles = {"width": 300, "bar_color": palette[128]}
 noise_slider_styles = {"width": 300, "bar_color": palette[200]}
 changing_noise_slider_styles = {"width": 300, "bar_color": palette[64]}
 
-# графіки
+# графіки (фіксований x_range: у джерелі лише видима частина, тож автодіапазон
+# стискався б до неї, а Reset має повертати весь сигнал)
 plot1 = figure(title="Гармоніка з накладеним шумом", x_axis_label='Час (с)', y_axis_label='Амплітуда',
-               x_axis_type="linear", y_axis_type="linear", background_fill_color="#F0F0F0")
+               x_axis_type="linear", y_axis_type="linear", background_fill_color="#F0F0F0",
+               x_range=(0, DURATION))
 
 plot2 = figure(title="Відфільтрована гармоніка", x_axis_label='Час (с)', y_axis_label='Амплітуда',
-               x_axis_type="linear", y_axis_type="linear", background_fill_color="#F0F0F0")
+               x_axis_type="linear", y_axis_type="linear", background_fill_color="#F0F0F0",
+               x_range=(0, DURATION))
 
 set_plot_properties(plot1, "Гармоніка з накладеним шумом", 750, 400)
 set_plot_properties(plot2, "Відфільтрована гармоніка", 750, 400)
@@ -113,8 +117,57 @@ reset_button = Button(label="Reset", button_type="success", width=100)
 new_noise_button = Button(label="Новий шум", button_type="warning", width=100)
 export_button = Button(label="Експорт даних", button_type="primary", width=100)
 
-# ф-ія оновлення графіків
+# параметри, від яких залежить результат вибраного фільтра
+def filter_key(filter_type, gaussian_std, gaussian_window, uniform_window, alpha):
+    if filter_type == "gaussian":
+        return (filter_type, gaussian_std, gaussian_window)
+    if filter_type == "uniform":
+        return (filter_type, uniform_window)
+    if filter_type == "exponential":
+        return (filter_type, alpha)
+    return (filter_type,)
+
+# нові значення в графік: якщо x той самий, надсилаю лише патч колонки y
+# (патч пише в масив джерела на місці, тому джерело отримує власну копію)
+def push_line(source, t, values, same_x=False):
+    if same_x:
+        source.patch({'y': [(slice(0, len(values)), values)]})
+    else:
+        source.data = {'x': np.array(t), 'y': np.array(values)}
+
+# у браузер іде лише проріджена видима частина (min/max на піксель), повні дані - для експорту
+shown_views = {}
+
+def draw_line(line, plot, t, values):
+    x_range = (plot.x_range.start, plot.x_range.end)
+    view = (values, t, x_range, plot.width)
+    previous = shown_views.get(line)
+    # ті самі дані в тому самому вікні - нічого не надсилаю
+    if previous is not None and previous[0] is values and previous[1] is t and previous[2:] == view[2:]:
+        return
+    shown_views[line] = view
+    t_view, y_view = decimate_view(t, values, x_range, plot.width)
+    # x лишається тим самим лише без проріджування (видно всі відліки діапазону):
+    # точки min/max залежать від значень, тож тоді - повна заміна джерела
+    start, stop = visible_slice(t, x_range)
+    same_x = previous is not None and previous[1] is t and previous[2:] == view[2:] and len(t_view) == stop - start
+    push_line(line.data_source, t_view, y_view, same_x)
+
+# серія подій від слайдерів за один кадр -> одне оновлення
+doc = curdoc()
+update_pending = False
+
 def update(attr, old, new):
+    global update_pending
+    if not update_pending:
+        update_pending = True
+        doc.add_timeout_callback(render, FRAME_MS)
+
+# ф-ія оновлення графіків
+def render():
+    global update_pending
+    update_pending = False
+
     amplitude = amp_slider.value
     frequency = freq_slider.value
     phase = phase_slider.value
@@ -127,19 +180,24 @@ def update(attr, old, new):
     uniform_window = int(uniform_window_slider.value)
     alpha_value = alpha_slider.value
 
-    t, y = harmonic_with_noise(amplitude, frequency, phase, noise_mean, noise_dispersion, show_noise)
-    line1.data_source.data = {'x': t, 'y': y}
-    plot1.title.text = f'Гармоніка з накладеним шумом (A={amplitude:.2f}, f={frequency:.2f}, φ={phase:.2f})'
+    # перераховую лише стадії, чиї параметри змінились
+    def filter_func(y):
+        if filter_type == "none":
+            return y
+        return filter_signal(y, filter_type, gaussian_std, gaussian_window, uniform_window, alpha_value)
 
-    if filter_type == "none":
-        filtered_y = y
-    else:
-        filtered_y = filter_signal(y, filter_type, gaussian_std, gaussian_window, uniform_window, alpha_value)
+    t, y, filtered_y, _ = pipeline.compute(
+        amplitude, frequency, phase, noise_mean, noise_dispersion, show_noise,
+        filter_key(filter_type, gaussian_std, gaussian_window, uniform_window, alpha_value), filter_func)
 
-    line2.data_source.data = {'x': t, 'y': filtered_y}
+    # draw_line сам пропускає лінії, у яких не змінились ні дані, ні видиме вікно
+    draw_line(line1, plot1, t, y)
+    plot1.title.text = f'Гармоніка з накладеним шумом (A={amplitude:.2f}, f={frequency:.2f}, φ={phase:.2f})'
+
+    draw_line(line2, plot2, t, filtered_y)
 
-# ф-ія експорту даних в txt файл
-def export_data(filename='data_export_bokeh.csv'):
+# ф-ія експорту даних (csv/npz/parquet) - запис іде у фоновому потоці
+def export_data(filename=f'data_export_bokeh.{EXPORT_FORMAT}'):
     time, y = harmonic_with_noise(amp_slider.value, freq_slider.value, phase_slider.value,
                                   noise_mean_slider.value, noise_dispersion_slider.value,
                                   0 in checkbox_group.active)
@@ -156,24 +214,22 @@ def export_data(filename='data_export_bokeh.csv'):
     alpha_value = alpha_slider.value
     gaussian_window = int(gaussian_window_slider.value)
 
-    # Отримання відфільтрованих даних
-    filtered_y = filter_signal(y, filter_type, gaussian_std, gaussian_window, uniform_window, alpha_value)
-
-    header = ["Time", "Original Signal", "Filtred Signal", "Amplitude", "Frequency",
-              "Phase", "Noise Mean", "Noise Covariance", "Show Noise", "Filter Type",
-              "Gaussian STD", "Gasussian Window", "Uniform Window", "Alpha"]
-    data = zip(time, y, filtered_y, [amplitude] * len(time), [frequency] * len(time),
-               [phase] * len(time), [noise_mean] * len(time), [noise_dispersion] * len(time),
-               [show_noise] * len(time), [filter_type] * len(time),
-               [gaussian_std] * len(time), [gaussian_window] * len(time),
-               [uniform_window] * len(time), [alpha_value] * len(time))
-
-    with open(filename, "w", newline='') as f:
-        writer = csv.writer(f, delimiter=",")
-        writer.writerow(header)
-        writer.writerows(data)
-    
-    print(f'Результати успішно збережено у файл: {os.path.abspath(filename)}')
+    # Отримання відфільтрованих даних ("none" - сигнал без змін, як на графіку)
+    if filter_type == "none":
+        filtered_y = y
+    else:
+        filtered_y = filter_signal(y, filter_type, gaussian_std, gaussian_window, uniform_window, alpha_value)
+
+    # параметри однакові для всіх відліків - пишуться один раз як метадані
+    metadata = {"Amplitude": amplitude, "Frequency": frequency, "Phase": phase,
+                "Noise Mean": noise_mean, "Noise Covariance": noise_dispersion,
+                "Show Noise": show_noise, "Filter Type": filter_type,
+                "Gaussian STD": gaussian_std, "Gasussian Window": gaussian_window,
+                "Uniform Window": uniform_window, "Alpha": alpha_value}
+    columns = {"Time": time, "Original Signal": y, "Filtred Signal": filtered_y}
+
+    return export_in_background(filename, columns, metadata, on_done=lambda path:
+                                print(f'Результати успішно збережено у файл: {path}'))
         
 # ф-ія reset
 def reset():
@@ -200,6 +256,13 @@ alpha_slider.on_change('value', update)
 gaussian_window_slider.on_change('value', update)
 reset_button.on_click(reset)
 new_noise_button.on_click(generate_new_noise)
+# зум/панорамування - деталізую видиму частину
+for plot in (plot1, plot2):
+    plot.x_range.on_change('start', update)
+    plot.x_range.on_change('end', update)
+
+# початкові графіки (далі - лише патчі)
+render()
 
 # лейаут
 layout = column(
@@ -213,4 +276,4 @@ curdoc().add_root(layout)
 
 # запуск    
 if __name__ == "__main__":
-    subprocess.run(["bokeh", "serve", "--show", __file__])
\ No newline at end of file
+    subprocess.run(["bokeh", "serve", "--show", __file__, "--args", *sys.argv[1:]])
\ No newline at end of file
@@ -0,0 +1,140 @@
+import os
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Parquet потребує pyarrow; без нього лишаються CSV та npz
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+EXPORT_FORMATS = ('csv', 'npz', 'parquet')
+CSV_CHUNK_ROWS = 1 << 16
+WRITE_BUFFER = 1 << 20
+
+# один фоновий потік: експорти йдуть по черзі, а інтерфейс не чекає на запис
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="signal-export")
+
+
+def export_format(argv=None):
+    # формат експорту з командного рядка (--export-format), за замовчуванням - csv як було
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--export-format', choices=EXPORT_FORMATS, default='csv')
+    args, _ = parser.parse_known_args(argv)
+    return args.export_format
+
+
+def _format_of(path, fmt):
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Невідомий формат експорту: {fmt!r}")
+    if fmt == 'parquet' and not HAS_PARQUET:
+        raise ImportError("Для експорту в Parquet потрібен pyarrow")
+    return fmt
+
+
+def _write_csv(f, columns, metadata, chunk_rows):
+    # параметри - один раз, рядками-коментарями (pd.read_csv(..., comment='#'))
+    for key, value in metadata.items():
+        f.write(f"# {key}: {value}\n")
+    f.write(",".join(columns) + "\n")
+
+    values = np.column_stack([np.asarray(col, dtype=np.float64) for col in columns.values()])
+    # %r для float - найкоротший запис без втрати точності (як у csv.writer)
+    row_format = ",".join(["%r"] * values.shape[1]) + "\n"
+    for start in range(0, len(values), chunk_rows):
+        chunk = values[start:start + chunk_rows]
+        # увесь шматок одним форматуванням рядка замість циклу по рядках
+        f.write((row_format * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def export_signal(path, columns, metadata=None, fmt=None, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Записує сигнал у файл: колонки відліків типізовано, параметри - один раз як метадані.
+
+    Параметри:
+    path (str): Шлях до файлу.
+    columns (dict): {назва колонки: масив відліків} однакової довжини.
+    metadata (dict): Параметри сигналу (амплітуда, фільтр, ...).
+    fmt (str): 'csv', 'npz' або 'parquet'; за замовчуванням - з розширення path.
+    chunk_rows (int): Скільки рядків CSV форматувати за раз.
+
+    Повертає:
+    Абсолютний шлях до записаного файлу.
+    """
+    fmt = _format_of(path, fmt)
+    metadata = dict(metadata or {})
+    # пишу у тимчасовий файл і перейменовую, щоб не лишити недописаний експорт
+    tmp_path = path + ".tmp"
+    if fmt == 'csv':
+        with open(tmp_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER) as f:
+            _write_csv(f, columns, metadata, chunk_rows)
+    elif fmt == 'npz':
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, metadata=np.array(json.dumps(metadata, ensure_ascii=False)),
+                     **{name: np.asarray(values) for name, values in columns.items()})
+    else:
+        table = pa.table({name: np.asarray(values) for name, values in columns.items()})
+        table = table.replace_schema_metadata({'signal': json.dumps(metadata, ensure_ascii=False)})
+        pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    return os.path.abspath(path)
+
+
+def read_signal(path, fmt=None):
+    """
+    Читає файл, записаний export_signal.
+
+    Повертає:
+    (columns, metadata) - словник колонок (numpy-масиви) і словник параметрів
+    (з CSV значення параметрів читаються як рядки).
+    """
+    fmt = _format_of(path, fmt)
+    if fmt == 'csv':
+        metadata = {}
+        with open(path, encoding='utf-8') as f:
+            line = f.readline()
+            while line.startswith('# '):
+                key, _, value = line[2:].rstrip('\n').partition(': ')
+                metadata[key] = value
+                line = f.readline()
+            names = line.rstrip('\n').split(',')
+            values = np.loadtxt(f, delimiter=',', ndmin=2)
+        return {name: values[:, i] for i, name in enumerate(names)}, metadata
+    if fmt == 'npz':
+        with np.load(path) as data:
+            metadata = json.loads(str(data['metadata']))
+            return {name: data[name] for name in data.files if name != 'metadata'}, metadata
+    table = pq.read_table(path)
+    metadata = json.loads(table.schema.metadata.get(b'signal', b'{}'))
+    return {name: table.column(name).to_numpy() for name in table.column_names}, metadata
+
+
+def export_in_background(path, columns, metadata=None, fmt=None, on_done=None):
+    """
+    export_signal у фоновому потоці - дашборд не зависає на експорті мільйонів відліків.
+    Масиви мають не змінюватись до кінця запису (конвеєр сигналу створює нові, тож це так).
+
+    Параметри:
+    on_done (callable): Викликається з абсолютним шляхом після успішного запису
+    (у фоновому потоці, тож графіки з неї не чіпати).
+
+    Повертає:
+    concurrent.futures.Future з абсолютним шляхом.
+    """
+    future = _executor.submit(export_signal, path, columns, metadata, fmt)
+
+    def report(done):
+        error = done.exception()
+        if error is not None:
+            print(f'Помилка експорту у {path}: {error}')
+        elif on_done is not None:
+            on_done(done.result())
+
+    future.add_done_callback(report)
+    return future
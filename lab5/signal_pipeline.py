@@ -0,0 +1,156 @@
+import argparse
+
+import numpy as np
+
+# за замовчуванням - як було: 1000 відліків на 10 секунд
+DEFAULT_SAMPLES = 1000
+DEFAULT_SAMPLE_RATE = 100.0
+
+
+class SignalPipeline:
+    """
+    Кешований конвеєр сигналу для дашбордів: вісь часу -> гармоніка -> шум -> фільтр.
+    Кожна стадія перераховується лише тоді, коли змінились її параметри,
+    тому рух слайдера фільтра не генерує гармоніку заново.
+    """
+
+    def __init__(self, noise, duration=10):
+        self.duration = duration
+        self.set_noise(noise)
+
+    def set_noise(self, noise):
+        # новий базовий шум (кнопка "Новий шум") - скидаю стадії, що від нього залежать
+        self.noise = np.asarray(noise, dtype=np.float64)
+        if getattr(self, 't', None) is None or len(self.t) != len(self.noise):
+            self.t = np.linspace(0, self.duration, len(self.noise))
+            self._harmonic_key = None
+        self._noise_key = None
+        self._signal_key = None
+        self._filter_key = None
+
+    def harmonic(self, amplitude, frequency, phase):
+        key = (amplitude, frequency, phase)
+        if key != self._harmonic_key:
+            self._harmonic = amplitude * np.sin(2 * np.pi * frequency * self.t + phase)
+            self._harmonic_key = key
+        return self._harmonic
+
+    def scaled_noise(self, noise_mean, noise_dispersion):
+        key = (noise_mean, noise_dispersion)
+        if key != self._noise_key:
+            self._scaled_noise = noise_mean + np.sqrt(noise_dispersion) * self.noise
+            self._noise_key = key
+        return self._scaled_noise
+
+    def compute(self, amplitude, frequency, phase, noise_mean, noise_dispersion, show_noise,
+                filter_key, filter_func):
+        """
+        Повертає (t, y, filtered_y, changed), де changed - множина з 'y' та/або 'filtered':
+        які масиви справді змінились з попереднього виклику (решту можна не перемальовувати).
+
+        filter_key - параметри фільтра (будь-який хешований кортеж),
+        filter_func - ф-ія y -> відфільтрований y для цих параметрів.
+        """
+        changed = set()
+        signal_key = (amplitude, frequency, phase, show_noise) + ((noise_mean, noise_dispersion) if show_noise else ())
+        if signal_key != self._signal_key:
+            y = self.harmonic(amplitude, frequency, phase)
+            if show_noise:
+                # той самий порядок операцій, що й у harmonic_with_noise
+                y = y + self.scaled_noise(noise_mean, noise_dispersion)
+            self._y = y
+            self._signal_key = signal_key
+            self._filter_key = None
+            changed.add('y')
+
+        if filter_key != self._filter_key:
+            self._filtered = filter_func(self._y)
+            self._filter_key = filter_key
+            changed.add('filtered')
+
+        return self.t, self._y, self._filtered, changed
+
+
+def signal_settings(argv=None):
+    """
+    Кількість відліків і частота дискретизації з аргументів командного рядка
+    (--samples, --rate); невідомі аргументи ігноруються.
+    Для Bokeh: bokeh serve lab5_3.py --args --samples 1000000 --rate 1000
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument('--rate', type=float, default=DEFAULT_SAMPLE_RATE)
+    args, _ = parser.parse_known_args(argv)
+    return args.samples, args.rate
+
+
+def visible_slice(t, x_range=None):
+    # межі індексів відліків, що потрапляють у видимий діапазон осі x (t відсортований)
+    if x_range is None or x_range[0] is None or x_range[1] is None:
+        return 0, len(t)
+    start = max(np.searchsorted(t, x_range[0], side='left') - 1, 0)
+    stop = min(np.searchsorted(t, x_range[1], side='right') + 1, len(t))
+    return start, stop
+
+
+def minmax_indices(y, n_bins):
+    """
+    Індекси мінімуму та максимуму в кожному з n_bins кошиків (у порядку появи) -
+    лінія з цих точок на n_bins пікселях виглядає так само, як з усіх відліків.
+    """
+    n = len(y)
+    if n <= 2 * n_bins:
+        return np.arange(n)
+    size = -(-n // n_bins)
+    # хвіст доповнюю останнім значенням, щоб розкласти в матрицю кошиків
+    padded = np.concatenate((y, np.full(size * n_bins - n, y[-1]))).reshape(n_bins, size)
+    offsets = np.arange(n_bins)[:, None] * size
+    pairs = np.sort(np.column_stack((padded.argmin(axis=1), padded.argmax(axis=1))), axis=1) + offsets
+    indices = np.unique(np.minimum(pairs.ravel(), n - 1))
+    # крайні точки завжди, щоб лінія доходила до країв
+    return np.union1d(indices, [0, n - 1])
+
+
+def lttb_indices(t, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: n_out точок, що найкраще зберігають форму лінії.
+    Повільніший за min/max (цикл по кошиках), але дає рівномірнішу картинку.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], max(edges[i + 1], edges[i] + 1)
+        # третя вершина - середнє наступного кошика (або остання точка)
+        next_start, next_stop = stop, edges[i + 2] if i + 2 < len(edges) else n
+        next_t = t[next_start:next_stop].mean() if next_stop > next_start else t[-1]
+        next_y = y[next_start:next_stop].mean() if next_stop > next_start else y[-1]
+
+        area = np.abs((t[previous] - next_t) * (y[start:stop] - y[previous])
+                      - (t[previous] - t[start:stop]) * (next_y - y[previous]))
+        previous = start + int(area.argmax())
+        indices[i + 1] = previous
+    return indices
+
+
+def decimate_view(t, y, x_range=None, width=800, method='minmax'):
+    """
+    Зменшена копія лінії для малювання: лише видимий діапазон x_range
+    і не більше ~2 точок на піксель ширини. Повні дані лишаються для експорту.
+
+    Повертає:
+    (t_view, y_view) - масиви для set_data / ColumnDataSource.
+    """
+    start, stop = visible_slice(t, x_range)
+    t_part, y_part = t[start:stop], y[start:stop]
+    width = max(int(width), 1)
+    if method == 'lttb':
+        indices = lttb_indices(t_part, y_part, 2 * width)
+    else:
+        indices = minmax_indices(y_part, width)
+    return t_part[indices], y_part[indices]
@@ -0,0 +1,132 @@
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from signal_tools import gaussian_filter, uniform_filter, exponential_filter
+
+SIGNAL_COLUMNS = ['amplitude', 'frequency', 'phase', 'noise_mean', 'noise_dispersion']
+FILTER_COLUMNS = ['filter_type', 'gaussian_window', 'gaussian_std', 'uniform_window', 'alpha']
+# скільки сигналів генерується й фільтрується одним 2-D масивом
+BLOCK_SIZE = 256
+
+
+def signal_grid(amplitude=(1.0,), frequency=(1.0,), phase=(0.0,), noise_mean=(0.0,), noise_dispersion=(0.1,)):
+    # усі комбінації параметрів гармоніки та шуму (як слайдери в lab5_3.py)
+    rows = itertools.product(amplitude, frequency, phase, noise_mean, noise_dispersion)
+    return pd.DataFrame(list(rows), columns=SIGNAL_COLUMNS, dtype=np.float64)
+
+
+def filter_grid(gaussian_window=(5,), gaussian_std=(2.0,), uniform_window=(5,), alpha=(0.6,), include_none=True):
+    """
+    Налаштування фільтрів для перебору: усі комбінації параметрів кожної родини фільтрів.
+    Параметри, яких родина не має, - NaN.
+    """
+    rows = [{'filter_type': 'none'}] if include_none else []
+    rows += [{'filter_type': 'gaussian', 'gaussian_window': window, 'gaussian_std': std}
+             for window, std in itertools.product(gaussian_window, gaussian_std)]
+    rows += [{'filter_type': 'uniform', 'uniform_window': window} for window in uniform_window]
+    rows += [{'filter_type': 'exponential', 'alpha': value} for value in alpha]
+    return pd.DataFrame(rows, columns=FILTER_COLUMNS)
+
+
+def harmonic_batch(t, amplitude, frequency, phase):
+    # гармоніки для масивів параметрів -> масив (кількість наборів, len(t))
+    return np.asarray(amplitude)[:, None] * np.sin(2 * np.pi * np.asarray(frequency)[:, None] * t
+                                                   + np.asarray(phase)[:, None])
+
+
+def apply_filter(y, config):
+    # той самий фільтр, що й filter_signal у lab5_3.py, але для батча сигналів по рядках
+    filter_type = config['filter_type']
+    if filter_type == 'none':
+        return y
+    if filter_type == 'gaussian':
+        return gaussian_filter(y, int(config['gaussian_window']), config['gaussian_std'])
+    if filter_type == 'uniform':
+        return uniform_filter(y, int(config['uniform_window']))
+    if filter_type == 'exponential':
+        return exponential_filter(y, config['alpha'])
+    raise ValueError(f"Невідомий фільтр: {filter_type!r}")
+
+
+def _evaluate_block(t, noise, params, filters):
+    # один блок сигналів проти всіх фільтрів; повертає масиви (сигнали, фільтри)
+    clean = harmonic_batch(t, params[:, 0], params[:, 1], params[:, 2])
+    noisy = clean + (params[:, 3:4] + np.sqrt(params[:, 4:5]) * noise)
+    power = np.mean(clean ** 2, axis=1)
+    input_mse = np.mean((noisy - clean) ** 2, axis=1)
+
+    mse = np.empty((len(params), len(filters)))
+    for j, config in enumerate(filters):
+        mse[:, j] = np.mean((apply_filter(noisy, config) - clean) ** 2, axis=1)
+    return mse, power, input_mse
+
+
+def sweep(signals, filters, n_samples=1000, duration=10, noise=None, seed=None, n_jobs=1,
+          block_size=BLOCK_SIZE):
+    """
+    Оцінює кожне налаштування фільтра на кожному сигналі: наскільки відфільтрований
+    сигнал з шумом близький до чистої гармоніки.
+
+    Параметри:
+    signals (pandas.DataFrame): Параметри сигналів (signal_grid).
+    filters (pandas.DataFrame): Налаштування фільтрів (filter_grid).
+    n_samples, duration: Кількість відліків і тривалість сигналу (с).
+    noise (numpy.ndarray або None): Базовий шум N(0, 1) довжини n_samples, спільний для
+    всіх сигналів (як BASE_NOISE у дашбордах); None - згенерувати з seed.
+    n_jobs (int або None): Кількість процесів для блоків сигналів (None - кількість ядер).
+    У Windows виклик з n_jobs != 1 має бути під if __name__ == "__main__".
+    block_size (int): Скільки сигналів обробляється одним 2-D масивом.
+
+    Повертає:
+    pandas.DataFrame - по рядку на (сигнал, фільтр) з колонками параметрів, mse, snr_db
+    (відношення сигнал/шум після фільтра), snr_gain_db (виграш відносно нефільтрованого)
+    і rank; відсортовано від найкращого (найменший mse) до найгіршого.
+    """
+    t = np.linspace(0, duration, n_samples)
+    if noise is None:
+        noise = np.random.default_rng(seed).normal(0, 1, n_samples)
+    params = signals[SIGNAL_COLUMNS].to_numpy(dtype=np.float64)
+    configs = filters[FILTER_COLUMNS].to_dict('records')
+
+    blocks = [params[start:start + block_size] for start in range(0, len(params), block_size)]
+    if n_jobs == 1 or len(blocks) <= 1:
+        parts = [_evaluate_block(t, noise, block, configs) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count()) as executor:
+            parts = list(executor.map(_evaluate_block, itertools.repeat(t), itertools.repeat(noise),
+                                      blocks, itertools.repeat(configs)))
+
+    mse = np.concatenate([part[0] for part in parts]) if parts else np.empty((0, len(configs)))
+    power = np.concatenate([part[1] for part in parts]) if parts else np.empty(0)
+    input_mse = np.concatenate([part[2] for part in parts]) if parts else np.empty(0)
+
+    # таблиця (сигнал x фільтр): рядок сигналу повторюється для кожного фільтра
+    n_signals, n_filters = mse.shape
+    results = pd.concat([signals[SIGNAL_COLUMNS].iloc[np.repeat(np.arange(n_signals), n_filters)].reset_index(drop=True),
+                         filters[FILTER_COLUMNS].iloc[np.tile(np.arange(n_filters), n_signals)].reset_index(drop=True)],
+                        axis=1)
+    results['mse'] = mse.ravel()
+    with np.errstate(divide='ignore'):
+        results['snr_db'] = 10 * np.log10(np.repeat(power, n_filters) / results['mse'].to_numpy())
+        results['snr_gain_db'] = 10 * np.log10(np.repeat(input_mse, n_filters) / results['mse'].to_numpy())
+
+    results = results.sort_values('mse', kind='stable', ignore_index=True)
+    results['rank'] = np.arange(1, len(results) + 1)
+    return results
+
+
+def rank_filters(results, metric='mse'):
+    """
+    Середні метрики кожного налаштування фільтра по всіх сигналах перебору -
+    який фільтр найкращий "загалом", а не для одного сигналу.
+    """
+    ascending = metric == 'mse'
+    summary = (results.groupby(FILTER_COLUMNS, dropna=False, sort=False)[['mse', 'snr_db', 'snr_gain_db']]
+               .mean().reset_index())
+    summary = summary.sort_values(metric, ascending=ascending, kind='stable', ignore_index=True)
+    summary['rank'] = np.arange(1, len(summary) + 1)
+    return summary
@@ -0,0 +1,220 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy import signal
+
+# межі вибору методу згортки (розмір вікна / відношення довжин сигналу і вікна)
+DIRECT_MAX_WINDOW = 128
+OVERLAP_ADD_RATIO = 16
+RUNNING_MEAN_MIN_WINDOW = 16
+
+
+@lru_cache(maxsize=64)
+def kernel(kind, window_size, sigma=None):
+    """
+    Нормоване вікно фільтра ('gaussian' або 'uniform') з кешу: слайдери
+    повторюють ті самі (тип, розмір, sigma), тож вікно будується лише один раз.
+    Масив лише для читання, бо спільний для всіх викликів.
+    """
+    window_size = int(window_size)
+    if kind == 'gaussian':
+        window = signal.windows.gaussian(window_size, std=sigma)
+        window = window / window.sum()
+    elif kind == 'uniform':
+        window = np.ones(window_size) / window_size
+    else:
+        raise ValueError(f"Невідоме вікно: {kind!r}")
+    window.flags.writeable = False
+    return window
+
+
+def convolve_same(y, window, method='auto'):
+    """
+    Згортка з результатом довжини сигналу (як signal.convolve(..., mode='same')).
+
+    method:
+    'direct' - пряма згортка, найшвидша для коротких вікон;
+    'fft' - через FFT усього сигналу, коли вікно порівнянне з сигналом;
+    'overlap-add' - FFT блоками, коли сигнал набагато довший за довге вікно;
+    'auto' - вибір за розмірами вікна та сигналу.
+
+    Для 2-D масиву (батч сигналів по рядках) згортка йде вздовж останньої осі.
+    """
+    y = np.asarray(y)
+    n = y.shape[-1]
+    if method == 'auto':
+        if len(window) <= DIRECT_MAX_WINDOW or n < len(window):
+            method = 'direct'
+        elif n >= OVERLAP_ADD_RATIO * len(window):
+            method = 'overlap-add'
+        else:
+            method = 'fft'
+
+    if y.ndim > 1:
+        return _convolve_rows(y, window, method)
+    if method == 'direct':
+        if len(y) >= len(window):
+            # np.convolve без накладних витрат scipy; для len(y) >= len(window) центрування те саме
+            return np.convolve(y, window, mode='same')
+        return signal.convolve(y, window, mode='same', method='direct')
+    if method == 'fft':
+        return signal.fftconvolve(y, window, mode='same')
+    if method == 'overlap-add':
+        return signal.oaconvolve(y, window, mode='same')
+    raise ValueError(f"Невідомий метод згортки: {method!r}")
+
+
+def _convolve_rows(y, window, method):
+    if method == 'direct':
+        # коротке вікно: np.convolve по рядках не повільніший за 2-D згортку scipy і дає ті самі числа, що й 1-D
+        rows = y.reshape(-1, y.shape[-1])
+        out = np.empty(rows.shape, dtype=np.result_type(rows, window))
+        for i, row in enumerate(rows):
+            out[i] = convolve_same(row, window, 'direct')
+        return out.reshape(y.shape)
+    window = np.reshape(window, (1,) * (y.ndim - 1) + (-1,))
+    if method == 'fft':
+        return signal.fftconvolve(y, window, mode='same', axes=-1)
+    if method == 'overlap-add':
+        return signal.oaconvolve(y, window, mode='same', axes=-1)
+    raise ValueError(f"Невідомий метод згортки: {method!r}")
+
+
+def running_mean_same(y, window_size):
+    """
+    Ковзне середнє за O(N) через кумулятивну суму: кожен вихід - різниця двох
+    префіксних сум, тож час не залежить від розміру вікна. Краї - як у 'same' (нулі за межами).
+    Для 2-D масиву - вздовж останньої осі.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    window_size = int(window_size)
+    n = y.shape[-1]
+
+    # сигнал з нулями по краях так, щоб вікно для виходу i було [i, i + window_size)
+    half = (window_size - 1) // 2
+    left = window_size - 1 - half
+    prefix = np.zeros(y.shape[:-1] + (n + window_size,))
+    np.cumsum(y, axis=-1, out=prefix[..., left + 1:left + 1 + n])
+    prefix[..., left + 1 + n:] = prefix[..., left + n:left + n + 1]
+
+    return (prefix[..., window_size:window_size + n] - prefix[..., :n]) / window_size
+
+
+# гаусівський фільтр (згортка з нормованим вікном)
+def gaussian_filter(y, window_size, sigma):
+    return convolve_same(y, kernel('gaussian', window_size, sigma))
+
+
+# рівномірний фільтр (ковзне середнє)
+def uniform_filter(y, window_size):
+    # для ширших вікон ковзна сума швидша за будь-яку згортку
+    if int(window_size) < RUNNING_MEAN_MIN_WINDOW:
+        return convolve_same(y, kernel('uniform', window_size))
+    return running_mean_same(y, window_size)
+
+
+# експоненційний фільтр: y[i] = alpha * x[i] + (1 - alpha) * y[i-1], y[0] = x[0]
+# рахую через lfilter (IIR першого порядку) - ті самі операції, що й у циклі, але без Python
+# (для 2-D масиву - кожен рядок окремо, вздовж останньої осі)
+def exponential_filter(y, alpha=0.6):
+    y = np.asarray(y)
+    filtered_y = np.zeros_like(y)
+    if y.shape[-1] == 0:
+        return filtered_y
+    filtered_y[..., 0] = y[..., 0]  # Перше значення не фільтруємо
+    # початковий стан фільтра - внесок першого значення в другий вихід
+    filtered_y[..., 1:], _ = signal.lfilter([alpha], [1, alpha - 1], y[..., 1:], axis=-1,
+                                           zi=(1 - alpha) * y[..., :1])
+    return filtered_y
+
+
+class FIRStream:
+    """
+    Потоковий КІХ-фільтр (згортка з вікном taps): приймає шматки сигналу і
+    зберігає між ними лише останні len(taps) - 1 значень.
+    Склеєний вихід process(...) + flush() дорівнює signal.convolve(y, taps, mode='same').
+    """
+
+    def __init__(self, taps):
+        self.taps = np.asarray(taps, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self._state = np.zeros(len(self.taps) - 1)
+        # 'same' центрує вікно, тобто вихід запізнюється на половину вікна
+        self._skip = (len(self.taps) - 1) // 2
+
+    def process(self, chunk):
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if len(chunk) == 0:
+            return chunk
+        out, self._state = signal.lfilter(self.taps, [1.0], chunk, zi=self._state)
+        if self._skip:
+            dropped = min(self._skip, len(out))
+            out = out[dropped:]
+            self._skip -= dropped
+        return out
+
+    def flush(self):
+        # хвіст сигналу: доповнюю нулями на половину вікна (як 'same' за краєм сигналу)
+        return self.process(np.zeros((len(self.taps) - 1) // 2))
+
+
+class GaussianStream(FIRStream):
+    def __init__(self, window_size, sigma):
+        super().__init__(kernel('gaussian', window_size, sigma))
+
+
+class UniformStream(FIRStream):
+    def __init__(self, window_size):
+        super().__init__(kernel('uniform', window_size))
+
+
+class ExponentialStream:
+    """Потоковий exponential_filter: між шматками зберігається одне попереднє значення."""
+
+    def __init__(self, alpha=0.6):
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        self._state = None
+
+    def process(self, chunk):
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if len(chunk) == 0:
+            return chunk
+        if self._state is None:
+            # перше значення сигналу проходить без змін
+            self._state = np.array([(1 - self.alpha) * chunk[0]])
+            return np.concatenate((chunk[:1], self.process(chunk[1:])))
+        out, self._state = signal.lfilter([self.alpha], [1, self.alpha - 1], chunk, zi=self._state)
+        return out
+
+    def flush(self):
+        return np.zeros(0)
+
+
+def make_stream(filter_type, gaussian_std=2, gaussian_window=5, uniform_window=5, alpha=0.6):
+    # ті самі назви фільтрів і параметри, що й у filter_signal з lab5_3.py
+    if filter_type == "gaussian":
+        return GaussianStream(gaussian_window, gaussian_std)
+    if filter_type == "uniform":
+        return UniformStream(uniform_window)
+    if filter_type == "exponential":
+        return ExponentialStream(alpha)
+    raise ValueError(f"Невідомий фільтр: {filter_type!r}")
+
+
+def filter_chunks(chunks, stream):
+    """
+    Фільтрує сигнал шматками (напр. довгий запис, прочитаний блоками) з постійною пам'яттю.
+    Генерує відфільтровані шматки; останній - хвіст фільтра після кінця сигналу.
+    """
+    for chunk in chunks:
+        out = stream.process(chunk)
+        if len(out):
+            yield out
+    tail = stream.flush()
+    if len(tail):
+        yield tail
@@ -0,0 +1,456 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import KFold
+from sklearn.utils import check_random_state
+from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+
+# метрики для перехресної перевірки (всі - "чим менше/більше, тим краще" без знаку мінус)
+CV_METRICS = {'mse': mean_squared_error, 'mae': mean_absolute_error, 'r2': r2_score}
+
+
+# Варіант 1 - безпосередньо, обчислюючи оцінки коефіцієнтів за формулам)
+def least_squares_method_1(x, y):
+    """
+    Знаходить оцінки коефіцієнтів k^ та b^ методом найменших квадратів.
+
+    Параметри:
+    x (numpy.ndarray): Вхідні дані незалежної змінної.
+    y (numpy.ndarray): Вхідні дані залежної змінної.
+
+    Повертає:
+    Обраховані коефіцієнтів k^ та b^.
+    """
+    # беремо середні значення x та y
+    x_mean = np.mean(x)
+    y_mean = np.mean(y)
+
+    # рахуємо чисельник та знаменник для підрахунку k^
+    numerator = np.sum((x - x_mean) * (y - y_mean))
+    denominator = np.sum((x - x_mean)**2)
+
+    if denominator == 0:
+        raise ValueError("Неможливо обчислити коефіцієнт k^, оскільки x є константою.")
+    
+    # k^ та b^ за формулою
+    k_hat = numerator / denominator  
+    b_hat = y_mean - k_hat * x_mean
+
+    return k_hat, b_hat
+
+
+# Варіант 2 - використовує numpy.linalg.lstsq, що виконує лінійну регресію з найменшими квадратами на основі матричних операцій.
+def least_squares_method_2(x, y):
+    # створення матриці A яка містить х та ствопець з 1
+    A = np.vstack([x, np.ones(len(x))]).T
+
+    # linalg.lstsq здійснює лінійну регресію з найменшими квадратами на основі цих матричних операцій
+    k_hat, b_hat = np.linalg.lstsq(A, y, rcond=None)[0]
+    return k_hat, b_hat
+
+
+def gradient_descent(x, y, learning_rate=0.01, n_iter=1000, initial_params=None):
+    """
+    Знаходить оцінки коефіцієнтів k^ та b^ методом градієнтного спуску.
+
+    Параметри:
+    x (numpy.ndarray): Вхідні дані незалежної змінної.
+    y (numpy.ndarray): Вхідні дані залежної змінної.
+    learning_rate (float): Коефіцієнт навчання (розмір кроку).
+    n_iter (int): Кількість ітерацій.
+    initial_params (tuple або None): Початкові значення k^ та b^. Якщо None, ініціалізуються нулями.
+
+    Повертає:
+    Обчислені коефіцієнти k^ та b^, історію значень MSE, MAE та R^2.
+    """
+    if len(x) == 0 or len(y) == 0:
+        return None, None, None, None, None
+    
+    if initial_params is None:
+        k_hat = 0  # Початкове наближення для k^
+        b_hat = 0  # Початкове наближення для b^
+    else:
+        k_hat, b_hat = initial_params
+
+    mse_history, mse_history2 = [], []  # Для збереження історії MSE
+    mae_history, mae_history2 = [], []  # Для збереження історії MAE
+    r2_history, r2_history2 = [], []   # Для збереження історії R^2
+
+    for _ in range(n_iter):
+        y_pred = k_hat * x + b_hat  # Обчислюємо поточні передбачення
+        errors = y - y_pred
+
+        # Обчислюємо часткові похідні функції втрат MSE
+        dk = -2 * np.mean(x * errors)
+        db = -2 * np.mean(errors)
+
+        # Оновлюємо параметри за правилом градієнтного спуску
+        k_hat = k_hat - learning_rate * dk
+        b_hat = b_hat - learning_rate * db
+
+        # 1 спосіб похибки (через методи sklearn)
+        mse = mean_squared_error(y, y_pred)
+        mae = mean_absolute_error(y, y_pred)
+        r2 = r2_score(y, y_pred)
+
+        mse_history.append(mse)
+        mae_history.append(mae)
+        r2_history.append(r2)
+
+        # 2 спосіб похибки (через нампай)
+        mse_2 = np.mean(errors ** 2)
+        mae_2 = np.mean(np.abs(errors))
+        r2_2 = 1 - np.sum(errors ** 2) / np.sum((y - np.mean(y)) ** 2)
+
+        mse_history2.append(mse_2)
+        mae_history2.append(mae_2)
+        r2_history2.append(r2_2)
+
+    return k_hat, b_hat, mse_history, mae_history, r2_history, mse_history2, mae_history2, r2_history2
+
+
+def _metrics(x, y, k_hat, b_hat, ss_tot):
+    # один прохід для MSE/MAE/R^2 поточної прямої
+    errors = y - (k_hat * x + b_hat)
+    sse = np.dot(errors, errors)
+    return sse / len(y), np.mean(np.abs(errors)), 1 - sse / ss_tot
+
+
+def train_linear_gd(x, y, learning_rate=0.01, n_iter=1000, initial_params=None, batch_size=None,
+                    record_every=1, tol=None, random_state=None):
+    """
+    Градієнтний спуск для y = kx + b без зайвої роботи на кожному кроці.
+
+    Повний батч (batch_size=None): градієнт MSE залежить лише від середніх та
+    коваріацій x і y, тому вони рахуються один раз, а крок коштує O(1) замість проходу по даним.
+    Міні-батч/SGD (batch_size=m): дані перемішуються раз на епоху, крок - один
+    злитий прохід по зрізу з m точок.
+
+    Параметри:
+    x (numpy.ndarray): Вхідні дані незалежної змінної.
+    y (numpy.ndarray): Вхідні дані залежної змінної.
+    learning_rate (float): Коефіцієнт навчання (розмір кроку).
+    n_iter (int): Максимальна кількість ітерацій.
+    initial_params (tuple або None): Початкові значення k^ та b^. Якщо None, ініціалізуються нулями.
+    batch_size (int або None): Розмір міні-батчу; None - весь датасет.
+    record_every (int): MSE, MAE та R^2 записуються кожні record_every ітерацій (і на останній).
+    tol (float або None): Зупинка, якщо MSE між двома записами зменшилась менше ніж на tol.
+    random_state (int або None): Сід для перемішування міні-батчів.
+
+    Повертає:
+    Обчислені коефіцієнти k^ та b^ і словник історії з масивами
+    iteration, mse, mae, r2 (значення до кроку з відповідним номером, як у gradient_descent).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) == 0 or len(y) == 0:
+        return None, None, None
+
+    k_hat, b_hat = (0.0, 0.0) if initial_params is None else map(float, initial_params)
+    n = len(x)
+
+    # сталі величини - один раз до циклу
+    x_mean, y_mean = x.mean(), y.mean()
+    x_centered, y_centered = x - x_mean, y - y_mean
+    var_x = np.dot(x_centered, x_centered) / n
+    var_y = np.dot(y_centered, y_centered) / n
+    cov_xy = np.dot(x_centered, y_centered) / n
+    ss_tot = var_y * n
+    del x_centered, y_centered
+
+    n_records = (n_iter - 1) // record_every + 2 if n_iter > 0 else 1
+    iterations = np.empty(n_records, dtype=np.int64)
+    mse_history = np.empty(n_records)
+    mae_history = np.empty(n_records)
+    r2_history = np.empty(n_records)
+    recorded = 0
+
+    full_batch = batch_size is None or batch_size >= n
+    if not full_batch:
+        rng = np.random.default_rng(random_state)
+        position = n  # перше звернення перемішає дані
+
+    step = 0
+    while step < n_iter:
+        if step % record_every == 0:
+            iterations[recorded] = step
+            mse_history[recorded], mae_history[recorded], r2_history[recorded] = _metrics(x, y, k_hat, b_hat, ss_tot)
+            recorded += 1
+            if tol is not None and recorded > 1 and mse_history[recorded - 2] - mse_history[recorded - 1] < tol:
+                break
+
+        if full_batch:
+            # похибка у зсуві: середнє (y - kx - b)
+            offset = y_mean - k_hat * x_mean - b_hat
+            dk = -2 * (cov_xy - k_hat * var_x + x_mean * offset)
+            db = -2 * offset
+        else:
+            if position + batch_size > n:
+                order = rng.permutation(n)
+                x_shuffled, y_shuffled = x[order], y[order]
+                position = 0
+            x_batch = x_shuffled[position:position + batch_size]
+            errors = y_shuffled[position:position + batch_size] - (k_hat * x_batch + b_hat)
+            position += batch_size
+            dk = -2 * np.dot(x_batch, errors) / batch_size
+            db = -2 * errors.sum() / batch_size
+
+        k_hat -= learning_rate * dk
+        b_hat -= learning_rate * db
+        step += 1
+
+    # стан після останнього кроку
+    if recorded == 0 or iterations[recorded - 1] != step:
+        iterations[recorded] = step
+        mse_history[recorded], mae_history[recorded], r2_history[recorded] = _metrics(x, y, k_hat, b_hat, ss_tot)
+        recorded += 1
+
+    history = {'iteration': iterations[:recorded], 'mse': mse_history[:recorded],
+               'mae': mae_history[:recorded], 'r2': r2_history[:recorded]}
+    return k_hat, b_hat, history
+
+
+def _fit_from_moments(n, mean_x, mean_y, sxx, syy, sxy):
+    """
+    k^, b^, MSE та R^2 з центрованих сум (sxx = sum((x - x_mean)^2) тощо).
+    Для груп, де x константа, k^ та b^ дорівнюють NaN.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k_hat = np.where(sxx > 0, sxy / sxx, np.nan)
+        b_hat = mean_y - k_hat * mean_x
+        # залишкова сума квадратів прямої МНК: syy - k^ * sxy
+        sse = np.maximum(syy - k_hat * sxy, 0)
+        mse = sse / n
+        r2 = 1 - sse / syy
+    return {'k': k_hat, 'b': b_hat, 'mse': mse, 'r2': r2, 'n': n}
+
+
+def least_squares_batch(x, y):
+    """
+    МНК одночасно для багатьох рядів однакової довжини.
+
+    Параметри:
+    x (numpy.ndarray): Масив (кількість рядів, точок) або (точок,) - спільний x для всіх рядів.
+    y (numpy.ndarray): Масив (кількість рядів, точок); NaN вважаються пропусками.
+
+    Повертає:
+    Словник з масивами k, b, mse, r2, n (по значенню на ряд).
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    valid = ~(np.isnan(x) | np.isnan(y))
+    n = valid.sum(axis=-1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = np.where(valid, x, 0).sum(axis=-1) / n
+        mean_y = np.where(valid, y, 0).sum(axis=-1) / n
+    x_centered = np.where(valid, x - mean_x[..., None], 0)
+    y_centered = np.where(valid, y - mean_y[..., None], 0)
+
+    return _fit_from_moments(n, mean_x, mean_y,
+                             np.einsum('...i,...i->...', x_centered, x_centered),
+                             np.einsum('...i,...i->...', y_centered, y_centered),
+                             np.einsum('...i,...i->...', x_centered, y_centered))
+
+
+def _group_moments(x, y, inverse, n_groups):
+    # центровані суми для кожної групи двома проходами bincount
+    n = np.bincount(inverse, minlength=n_groups).astype(np.float64)
+    mean_x = np.bincount(inverse, x, n_groups) / n
+    mean_y = np.bincount(inverse, y, n_groups) / n
+    x_centered = x - mean_x[inverse]
+    y_centered = y - mean_y[inverse]
+    return (n, mean_x, mean_y,
+            np.bincount(inverse, x_centered * x_centered, n_groups),
+            np.bincount(inverse, y_centered * y_centered, n_groups),
+            np.bincount(inverse, x_centered * y_centered, n_groups))
+
+
+def least_squares_grouped(x, y, groups):
+    """
+    МНК для рядів різної довжини, записаних підряд з ідентифікатором групи
+    (напр. область для VHI або дата для даних споживання). Без циклів по групах, O(кількість точок).
+
+    Параметри:
+    x, y (numpy.ndarray): Значення всіх рядів одним масивом.
+    groups (numpy.ndarray): Ідентифікатор групи для кожної точки.
+
+    Повертає:
+    Словник з масивами group, k, b, mse, r2, n (групи відсортовані).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    group_ids, inverse = np.unique(np.asarray(groups), return_inverse=True)
+    result = _fit_from_moments(*_group_moments(x, y, inverse.ravel(), len(group_ids)))
+    return {'group': group_ids, **result}
+
+
+class StreamingLeastSquares:
+    """
+    МНК, що оновлюється порціями точок: зберігає лише достатню статистику
+    (кількість, середні та центровані суми) для кожної групи, а не самі точки.
+    Порції об'єднуються формулами Чана, тому точність не падає з кількістю точок.
+    """
+
+    def __init__(self):
+        self._slots = {}
+        self.group_ids = []
+        self.n = np.zeros(0)
+        self.mean_x = np.zeros(0)
+        self.mean_y = np.zeros(0)
+        self.sxx = np.zeros(0)
+        self.syy = np.zeros(0)
+        self.sxy = np.zeros(0)
+
+    def _grow(self, count):
+        for name in ('n', 'mean_x', 'mean_y', 'sxx', 'syy', 'sxy'):
+            setattr(self, name, np.concatenate((getattr(self, name), np.zeros(count))))
+
+    def update(self, x, y, groups=None):
+        """Додає порцію точок; groups=None - усі точки в одній групі."""
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if len(x) == 0:
+            return self
+        if groups is None:
+            groups = np.zeros(len(x), dtype=np.int64)
+        group_ids, inverse = np.unique(np.asarray(groups), return_inverse=True)
+        n_b, mean_x_b, mean_y_b, sxx_b, syy_b, sxy_b = _group_moments(x, y, inverse.ravel(), len(group_ids))
+
+        # нові групи отримують нові комірки
+        new_groups = [group for group in group_ids.tolist() if group not in self._slots]
+        for group in new_groups:
+            self._slots[group] = len(self.group_ids)
+            self.group_ids.append(group)
+        self._grow(len(new_groups))
+        slots = np.array([self._slots[group] for group in group_ids.tolist()])
+
+        n_a = self.n[slots]
+        n = n_a + n_b
+        dx = mean_x_b - self.mean_x[slots]
+        dy = mean_y_b - self.mean_y[slots]
+        weight = n_a * n_b / n
+        self.sxx[slots] += sxx_b + dx * dx * weight
+        self.syy[slots] += syy_b + dy * dy * weight
+        self.sxy[slots] += sxy_b + dx * dy * weight
+        self.mean_x[slots] += dx * n_b / n
+        self.mean_y[slots] += dy * n_b / n
+        self.n[slots] = n
+        return self
+
+    def result(self):
+        """Поточні k, b, mse, r2, n для кожної групи (у порядку першої появи)."""
+        return {'group': np.array(self.group_ids),
+                **_fit_from_moments(self.n, self.mean_x, self.mean_y, self.sxx, self.syy, self.sxy)}
+
+
+def _as_features(x):
+    x = np.asarray(x)
+    return x.reshape(-1, 1) if x.ndim == 1 else x
+
+
+def _score_fold(estimator, X, y, train, test, metrics):
+    # одне навчання на фолд, всі метрики з тих самих передбачень
+    model = clone(estimator).fit(X[train], y[train])
+    y_pred = model.predict(X[test])
+    return {name: CV_METRICS[name](y[test], y_pred) for name in metrics}
+
+
+def cross_validate_regression(x, y, cv=None, estimator=None, metrics=('mse', 'mae', 'r2'), n_jobs=None,
+                              backend='thread'):
+    """
+    Перехресна перевірка, де кожен фолд навчається один раз, а MSE/MAE/R^2
+    рахуються з тих самих передбачень (замість окремого cross_val_score на кожну метрику).
+
+    Параметри:
+    x, y (numpy.ndarray): Дані (x - вектор або матриця ознак).
+    cv (KFold або int або None): Розбиття; int - KFold(cv, shuffle=True, random_state=42), None - 20 фолдів.
+    estimator: Модель з fit/predict (за замовчуванням LinearRegression).
+    metrics (tuple): Назви метрик з CV_METRICS.
+    n_jobs (int або None): Кількість паралельних фолдів (None - кількість ядер).
+    backend (str): 'thread' або 'process'.
+
+    Повертає:
+    Словник {метрика: масив значень по фолдах}.
+    """
+    if cv is None or isinstance(cv, int):
+        cv = KFold(n_splits=cv or 20, shuffle=True, random_state=42)
+    estimator = LinearRegression() if estimator is None else estimator
+    X, y = _as_features(x), np.asarray(y)
+
+    executor_class = ProcessPoolExecutor if backend == 'process' else ThreadPoolExecutor
+    splits = list(cv.split(X, y))
+    with executor_class(max_workers=n_jobs or os.cpu_count()) as executor:
+        futures = [executor.submit(_score_fold, estimator, X, y, train, test, metrics) for train, test in splits]
+        scores = [future.result() for future in futures]
+    return {name: np.array([fold[name] for fold in scores]) for name in metrics}
+
+
+def fold_assignment(cv, n_samples):
+    """
+    Номер відкладеного фолду для кожної точки. Для KFold рахується так само,
+    як у sklearn (перемішування з тим самим random_state), але без масок на кожен фолд.
+    """
+    fold = np.empty(n_samples, dtype=np.intp)
+    if type(cv) is KFold:
+        indices = np.arange(n_samples)
+        if cv.shuffle:
+            check_random_state(cv.random_state).shuffle(indices)
+        sizes = np.full(cv.n_splits, n_samples // cv.n_splits)
+        sizes[:n_samples % cv.n_splits] += 1
+        fold[indices] = np.repeat(np.arange(cv.n_splits), sizes)
+        return fold
+
+    for i, (_, test) in enumerate(cv.split(np.zeros((n_samples, 1)))):
+        fold[test] = i
+    return fold
+
+
+def cross_validate_ols(x, y, cv=None):
+    """
+    Точна перехресна перевірка для МНК з однією ознакою без повторного навчання:
+    суми по навчальній частині фолду = глобальні суми - суми по відкладеній частині,
+    тож k^ та b^ для всіх фолдів рахуються одразу, а MAE - ще одним проходом.
+
+    Параметри:
+    x, y (numpy.ndarray): Вектори даних.
+    cv (KFold або int або None): Як у cross_validate_regression.
+
+    Повертає:
+    Словник {'mse', 'mae', 'r2', 'k', 'b': масив по фолдах}.
+    """
+    if cv is None or isinstance(cv, int):
+        cv = KFold(n_splits=cv or 20, shuffle=True, random_state=42)
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+
+    fold = fold_assignment(cv, len(x))
+    n_folds = cv.get_n_splits()
+
+    # центрую один раз, щоб суми квадратів не втрачали точність
+    x_mean, y_mean = x.mean(), y.mean()
+    xc, yc = x - x_mean, y - y_mean
+
+    def fold_sums(values):
+        return np.bincount(fold, values, n_folds)
+
+    n_test = np.bincount(fold, minlength=n_folds).astype(np.float64)
+    sx, sy = fold_sums(xc), fold_sums(yc)
+    sxx, syy, sxy = fold_sums(xc * xc), fold_sums(yc * yc), fold_sums(xc * yc)
+
+    n_train = len(x) - n_test
+    tx, ty = xc.sum() - sx, yc.sum() - sy
+    txx, txy = np.dot(xc, xc) - sxx, np.dot(xc, yc) - sxy
+    k_hat = (n_train * txy - tx * ty) / (n_train * txx - tx * tx)
+    b_centered = (ty - k_hat * tx) / n_train
+
+    # помилки на відкладених точках
+    sse = syy - 2 * k_hat * sxy - 2 * b_centered * sy + k_hat ** 2 * sxx \
+        + 2 * k_hat * b_centered * sx + n_test * b_centered ** 2
+    sst = syy - sy * sy / n_test
+    mae = fold_sums(np.abs(yc - k_hat[fold] * xc - b_centered[fold])) / n_test
+
+    return {'mse': sse / n_test, 'mae': mae, 'r2': 1 - sse / sst,
+            'k': k_hat, 'b': b_centered + y_mean - k_hat * x_mean}
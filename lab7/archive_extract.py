@@ -0,0 +1,178 @@
+import os
+import json
+import zlib
+import shutil
+import fnmatch
+import zipfile
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from raster_pipeline import SENTINEL_BANDS, LANDSAT_BANDS
+
+# файли, які потрібні конвеєру lab_7: канали R60m Sentinel-2 і вибрані канали Landsat
+SENTINEL_MEMBERS = tuple(f"*/img_data/r60m/*_{band.lower()}_60m.jp2" for band in SENTINEL_BANDS)
+LANDSAT_MEMBERS = tuple(f"*_{band.lower()}.tif" for band in LANDSAT_BANDS)
+# векторні межі для обрізання (full_data/Kyiv_regions.shp) з усіма файлами-супутниками
+SHAPE_MEMBERS = ('*.shp', '*.shx', '*.dbf', '*.prj', '*.cpg')
+# теки продуктів -> короткі назви, які використовує ноутбук
+PRODUCT_FOLDERS = {
+    'S2A_MSIL2A*T36UUA*': 'data_sentinel_A',
+    'S2A_MSIL2A*T36UUB*': 'data_sentinel_B',
+    'LC08_L1TP_182025*': 'data_lanset_A',
+    'LC08_L1TP_182026*': 'data_lanset_B',
+}
+MANIFEST_NAME = ".extract_manifest.json"
+COPY_BUFFER = 1 << 20
+
+
+def wanted(name, patterns):
+    # чи потрібен член архіву (шаблони fnmatch без урахування регістру; вкладені zip - завжди)
+    name = name.lower()
+    return name.endswith(".zip") or any(fnmatch.fnmatch(name, pattern.lower()) for pattern in patterns)
+
+
+def target_path(name, rename):
+    # шлях у теці результату: теки продуктів одразу з новими назвами, без окремого перейменування.
+    # Як ZipFile.extract: диск, корінь, '.' і '..' відкидаються - нічого не пишеться поза out_dir
+    name = os.path.splitdrive(name.replace('\\', '/'))[1]
+    parts = [part for part in name.split('/') if part not in ('', '.', '..')]
+    if not parts:
+        return None
+    for i, part in enumerate(parts[:-1]):
+        for pattern, new_name in rename.items():
+            if fnmatch.fnmatch(part, pattern):
+                parts[i] = new_name
+                break
+    return os.path.join(*parts)
+
+
+def file_crc(path):
+    crc = 0
+    with open(path, 'rb') as f:
+        while chunk := f.read(COPY_BUFFER):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _extract_member(archive, info, path):
+    # потоково у тимчасовий файл і перейменування: перерваний запуск не лишає обрізаних файлів
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + ".part"
+    with archive.open(info) as src, open(tmp_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst, COPY_BUFFER)
+    os.replace(tmp_path, path)
+
+
+def _extract_archive(archive_path, out_dir, patterns, rename, known):
+    """
+    Розпаковує з архіву лише потрібні файли; вкладені zip обробляються рекурсивно
+    (у корінь out_dir, як extract_recursive у ноутбуці) і видаляються.
+
+    known - {відносний шлях: [розмір, crc]} з маніфесту: такі файли з тим самим
+    розміром не перечитуються; інші наявні файли перевіряються за CRC.
+
+    Повертає:
+    (files, extracted, skipped) - {відносний шлях: [розмір, crc]} і лічильники.
+    """
+    files, extracted, skipped = {}, 0, 0
+    with zipfile.ZipFile(archive_path) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not wanted(info.filename, patterns):
+                continue
+            if info.filename.lower().endswith('.zip'):
+                # вкладений архів - у тимчасовий файл поруч із результатом
+                fd, nested_path = tempfile.mkstemp(suffix=".zip", dir=out_dir)
+                os.close(fd)
+                try:
+                    with archive.open(info) as src, open(nested_path, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, COPY_BUFFER)
+                    nested = _extract_archive(nested_path, out_dir, patterns, rename, known)
+                finally:
+                    os.remove(nested_path)
+                files.update(nested[0])
+                extracted += nested[1]
+                skipped += nested[2]
+                continue
+
+            relative = target_path(info.filename, rename)
+            if relative is None:
+                continue
+            path = os.path.join(out_dir, relative)
+            record = [info.file_size, info.CRC]
+            if os.path.exists(path) and os.path.getsize(path) == info.file_size \
+                    and (known.get(relative) == record or file_crc(path) == info.CRC):
+                skipped += 1
+            else:
+                _extract_member(archive, info, path)
+                extracted += 1
+            files[relative] = record
+    return files, extracted, skipped
+
+
+def _read_manifest(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(path, manifest):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def extract_archives(data_dir, out_dir, patterns=SENTINEL_MEMBERS + LANDSAT_MEMBERS + SHAPE_MEMBERS,
+                     rename=PRODUCT_FOLDERS, n_jobs=None, verify=False):
+    """
+    Вибірково розпаковує всі zip з data_dir у out_dir за маніфестом (out_dir/.extract_manifest.json).
+
+    Архів, що не змінився (розмір, mtime, шаблони) і всі файли якого на місці,
+    пропускається без відкриття; у зміненому розпаковуються лише відсутні або
+    інші за розміром/CRC файли. Незалежні архіви розпаковуються паралельно в процесах.
+
+    Параметри:
+    patterns (tuple): Шаблони потрібних файлів (fnmatch по шляху в архіві, без урахування регістру).
+    rename (dict): {шаблон назви теки: нова назва}.
+    n_jobs (int або None): Кількість процесів (None - кількість ядер).
+    verify (bool): Перевірити CRC усіх наявних файлів, навіть якщо маніфест каже, що все на місці.
+
+    Повертає:
+    Словник {архів: {'extracted': ..., 'skipped': ..., 'cached': bool}}.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    manifest = _read_manifest(manifest_path)
+    settings = {'patterns': list(patterns), 'rename': rename}
+
+    summary, pending = {}, []
+    for name in sorted(os.listdir(data_dir)):
+        if not name.lower().endswith('.zip'):
+            continue
+        archive_path = os.path.join(data_dir, name)
+        stat = os.stat(archive_path)
+        source = {'size': stat.st_size, 'mtime': stat.st_mtime, **settings}
+        entry = manifest.get(name)
+        unchanged = not verify and entry is not None and entry['source'] == source
+        if unchanged and all(
+                os.path.exists(os.path.join(out_dir, relative)) and os.path.getsize(os.path.join(out_dir, relative)) == size
+                for relative, (size, _) in entry['files'].items()):
+            summary[name] = {'extracted': 0, 'skipped': len(entry['files']), 'cached': True}
+            continue
+        # записам маніфесту довіряю лише для того самого архіву; інакше - перевірка CRC
+        known = entry['files'] if unchanged else {}
+        pending.append((name, archive_path, source, known))
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=min(n_jobs or os.cpu_count(), len(pending))) as executor:
+            futures = [(name, source, executor.submit(_extract_archive, archive_path, out_dir, patterns, rename, known))
+                       for name, archive_path, source, known in pending]
+            for name, source, future in futures:
+                files, extracted, skipped = future.result()
+                manifest[name] = {'source': source, 'files': files}
+                summary[name] = {'extracted': extracted, 'skipped': skipped, 'cached': False}
+                # маніфест оновлюю після кожного архіву - перерваний запуск не втрачає зробленого
+                _write_manifest(manifest_path, manifest)
+    return summary
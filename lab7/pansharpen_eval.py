@@ -0,0 +1,171 @@
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.vrt import WarpedVRT
+
+from raster_pipeline import BLOCK_SIZE, block_windows, gdal_creation_args, add_overviews
+
+PANSHARPEN_METHODS = ('average', 'nearest', 'bilinear', 'cubic', 'cubicspline', 'lanczos')
+
+
+def run_pansharpen(pan_path, ms_path, out_dir, methods=PANSHARPEN_METHODS, n_jobs=None):
+    """
+    gdal_pansharpen.py для кожного методу перевибірки паралельно.
+    Кожен запуск - окремий процес gdal_pansharpen.py, тож потоки лише чекають на них.
+    Результати - тайлові стиснені GeoTIFF з оглядами.
+
+    Повертає:
+    Словник {метод: шлях до результату}.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = {method: os.path.join(out_dir, f"pansharpen_{method}.tif") for method in methods}
+
+    def run(method):
+        subprocess.run(['gdal_pansharpen.py', '-r', method, *gdal_creation_args(), pan_path, ms_path, outputs[method]],
+                       check=True)
+        add_overviews(outputs[method])
+
+    with ThreadPoolExecutor(max_workers=n_jobs or os.cpu_count()) as executor:
+        list(executor.map(run, methods))
+    return outputs
+
+
+class BandStats:
+    """
+    Потокові достатні статистики порівняння растра з еталоном по каналах:
+    кількість пікселів, середні та M2 (сума квадратів відхилень) обох растрів і сума
+    квадратів похибок. Блоки зливаються формулою Чана, тож точність як у двопрохідного підрахунку.
+    """
+
+    def __init__(self, n_bands):
+        self.n = np.zeros(n_bands)
+        self.mean_ref = np.zeros(n_bands)
+        self.m2_ref = np.zeros(n_bands)
+        self.mean_pred = np.zeros(n_bands)
+        self.m2_pred = np.zeros(n_bands)
+        self.sse = np.zeros(n_bands)
+
+    @staticmethod
+    def _merge(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean_b - mean_a
+            mean = np.where(n > 0, mean_a + delta * n_b / n, 0.0)
+            m2 = m2_a + m2_b + np.where(n > 0, delta ** 2 * n_a * n_b / n, 0.0)
+        return mean, m2
+
+    def update(self, reference, predicted, valid):
+        # reference, predicted: (канали, h, w); valid - маска пікселів, які порівнюються
+        reference = reference.reshape(len(self.n), -1).astype(np.float64)
+        predicted = predicted.reshape(len(self.n), -1).astype(np.float64)
+        valid = valid.reshape(len(self.n), -1)
+
+        n_b = valid.sum(axis=1).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_ref_b = np.where(valid, reference, 0).sum(axis=1) / n_b
+            mean_pred_b = np.where(valid, predicted, 0).sum(axis=1) / n_b
+        mean_ref_b, mean_pred_b = np.nan_to_num(mean_ref_b), np.nan_to_num(mean_pred_b)
+        m2_ref_b = np.where(valid, (reference - mean_ref_b[:, None]) ** 2, 0).sum(axis=1)
+        m2_pred_b = np.where(valid, (predicted - mean_pred_b[:, None]) ** 2, 0).sum(axis=1)
+
+        self.sse += np.where(valid, (reference - predicted) ** 2, 0).sum(axis=1)
+        self.mean_ref, self.m2_ref = self._merge(self.n, self.mean_ref, self.m2_ref, n_b, mean_ref_b, m2_ref_b)
+        self.mean_pred, self.m2_pred = self._merge(self.n, self.mean_pred, self.m2_pred, n_b, mean_pred_b, m2_pred_b)
+        self.n += n_b
+
+    def band_table(self):
+        # R^2 і MSE кожного каналу окремо
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return pd.DataFrame({'band': np.arange(1, len(self.n) + 1), 'n': self.n.astype(np.int64),
+                                 'mean_ref': self.mean_ref, 'mean_pred': self.mean_pred,
+                                 'std_ref': np.sqrt(self.m2_ref / self.n), 'std_pred': np.sqrt(self.m2_pred / self.n),
+                                 'mse': self.sse / self.n, 'r2': 1 - self.sse / self.m2_ref})
+
+    def overall(self):
+        # як r2_score по сплющених масивах усіх каналів: канали зливаються в одну вибірку
+        n = self.n.sum()
+        if n == 0:
+            return {'n': 0, 'mse': np.nan, 'r2': np.nan}
+        mean = (self.n * self.mean_ref).sum() / n
+        m2 = (self.m2_ref + self.n * (self.mean_ref - mean) ** 2).sum()
+        sse = self.sse.sum()
+        return {'n': int(n), 'mse': sse / n, 'r2': 1 - sse / m2 if m2 > 0 else np.nan}
+
+
+def _valid_mask(data, nodata):
+    valid = np.ones(data.shape, dtype=bool)
+    if np.issubdtype(data.dtype, np.floating):
+        valid &= ~np.isnan(data)
+    if nodata is not None and not (isinstance(nodata, float) and np.isnan(nodata)):
+        valid &= data != nodata
+    return valid
+
+
+def compare_rasters(reference_path, predicted_path, bands=None, block_size=BLOCK_SIZE, resampling='nearest'):
+    """
+    Порівнює растр з еталоном блоками, не завантажуючи жоден повністю.
+    Якщо сітки різні (розмір, роздільність, CRS), прогноз читається на сітку еталона
+    через WarpedVRT; пікселі nodata/NaN у будь-якому з растрів і пікселі еталона,
+    яких прогноз не покриває, не враховуються.
+
+    Параметри:
+    bands (int або None): Скільки перших каналів порівнювати; None - спільні для обох.
+
+    Повертає:
+    BandStats з накопиченими статистиками.
+    """
+    with rasterio.open(reference_path) as ref, rasterio.open(predicted_path) as pred:
+        n_bands = bands or min(ref.count, pred.count)
+        indexes = list(range(1, n_bands + 1))
+        aligned = (pred.crs == ref.crs and pred.transform == ref.transform
+                   and (pred.width, pred.height) == (ref.width, ref.height))
+        # alpha-канал VRT позначає пікселі поза покриттям прогнозу: без nodata там були б нулі
+        source = pred if aligned else WarpedVRT(pred, crs=ref.crs, transform=ref.transform, width=ref.width,
+                                                height=ref.height, resampling=Resampling[resampling], add_alpha=True)
+        stats = BandStats(n_bands)
+        try:
+            for window in block_windows(ref.width, ref.height, block_size):
+                reference = ref.read(indexes, window=window)
+                predicted = source.read(indexes, window=window)
+                valid = _valid_mask(reference, ref.nodata) & _valid_mask(predicted, source.nodata)
+                if source is not pred:
+                    valid &= source.dataset_mask(window=window) > 0
+                stats.update(reference, predicted, valid)
+        finally:
+            if source is not pred:
+                source.close()
+    return stats
+
+
+def _compare_method(reference_path, predicted_path, bands, block_size):
+    stats = compare_rasters(reference_path, predicted_path, bands, block_size)
+    return stats.overall(), stats.band_table()
+
+
+def evaluate_methods(reference_path, outputs, bands=None, block_size=BLOCK_SIZE, n_jobs=None):
+    """
+    Метрики точності кожного результату паншарпенінгу відносно еталона,
+    по процесу на метод.
+
+    Параметри:
+    outputs (dict): {метод: шлях}, напр. результат run_pansharpen.
+
+    Повертає:
+    (scores, band_scores) - DataFrame з r2/mse/n по методах (від найкращого R^2)
+    і DataFrame зі статистиками кожного каналу для кожного методу.
+    """
+    with ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count()) as executor:
+        futures = {method: executor.submit(_compare_method, reference_path, path, bands, block_size)
+                   for method, path in outputs.items()}
+        results = {method: future.result() for method, future in futures.items()}
+
+    scores = pd.DataFrame({method: overall for method, (overall, _) in results.items()}).T
+    scores = scores.astype({'n': np.int64, 'mse': np.float64, 'r2': np.float64})
+    scores = scores.sort_values('r2', ascending=False, kind='stable')
+    band_scores = pd.concat({method: table for method, (_, table) in results.items()}, names=['method', None])
+    return scores, band_scores.reset_index(level=1, drop=True).reset_index()
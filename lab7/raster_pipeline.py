@@ -0,0 +1,327 @@
+import os
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import rasterio
+from rasterio import windows
+from rasterio.enums import Resampling
+from rasterio.features import geometry_mask
+from rasterio.vrt import WarpedVRT
+from rasterio.warp import calculate_default_transform, transform_bounds, transform_geom
+
+# shapefile з межами читається через fiona; без неї геометрії можна передати готовими
+try:
+    import fiona
+    HAS_FIONA = True
+except ImportError:
+    HAS_FIONA = False
+
+SENTINEL_BANDS = ('B02', 'B03', 'B04', 'B8A')
+LANDSAT_BANDS = ('B2', 'B3', 'B4', 'B8')
+BLOCK_SIZE = 512
+# стиснення результатів; predictor 2 (різниці сусідів) для цілих, 3 для float.
+# zlevel 1: файл лише на кілька відсотків більший, ніж з типовим 6, а запис удвічі швидший
+COMPRESS = 'deflate'
+DEFLATE_LEVEL = 1
+# огляди будуються, доки менша сторона не стане меншою за OVERVIEW_MIN_SIZE
+OVERVIEW_MIN_SIZE = 256
+PREVIEW_SIZE = 1024
+
+
+def read_shapes(path, crs=None):
+    """
+    Геометрії з векторного файлу (напр. full_data/Kyiv_regions.shp), за потреби
+    перепроєктовані в crs - для параметра clip у mosaic.
+    """
+    if not HAS_FIONA:
+        raise ImportError("Для читання векторних файлів потрібна fiona")
+    with fiona.open(path) as layer:
+        shapes = [feature['geometry'] for feature in layer]
+        src_crs = layer.crs
+    if crs is not None and src_crs:
+        shapes = [transform_geom(src_crs, crs, shape) for shape in shapes]
+    return shapes
+
+
+def _shapes_bounds(shapes):
+    # межі (left, bottom, right, top) набору GeoJSON-геометрій
+    coords = []
+
+    def collect(item):
+        if isinstance(item[0], (int, float)):
+            coords.append(item[:2])
+        else:
+            for sub in item:
+                collect(sub)
+
+    for shape in shapes:
+        geometry = shape.__geo_interface__ if hasattr(shape, '__geo_interface__') else shape
+        collect(geometry['coordinates'])
+    xs, ys = zip(*coords)
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def output_grid(scenes, dst_crs=None, resolution=None, clip=None):
+    """
+    Сітка результату: CRS, transform, width, height.
+    Як у gdal_merge/gdalwarp - роздільність першого каналу першої сцени (або resolution),
+    охоплення - об'єднання всіх сцен, обрізане до меж clip (crop_to_cutline).
+    """
+    first = next(iter(scenes[0].values()))
+    with rasterio.open(first) as src:
+        crs = rasterio.crs.CRS.from_user_input(dst_crs) if dst_crs is not None else src.crs
+        if resolution is None:
+            if src.crs == crs:
+                resolution = src.res
+            else:
+                transform, _, _ = calculate_default_transform(src.crs, crs, src.width, src.height, *src.bounds)
+                resolution = (transform.a, -transform.e)
+
+    bounds = []
+    for scene in scenes:
+        for path in scene.values():
+            with rasterio.open(path) as src:
+                bounds.append(transform_bounds(src.crs, crs, *src.bounds, densify_pts=21))
+
+    left, bottom = min(b[0] for b in bounds), min(b[1] for b in bounds)
+    right, top = max(b[2] for b in bounds), max(b[3] for b in bounds)
+    if clip is not None:
+        clip_left, clip_bottom, clip_right, clip_top = _shapes_bounds(clip)
+        left, bottom = max(left, clip_left), max(bottom, clip_bottom)
+        right, top = min(right, clip_right), min(top, clip_top)
+        if left >= right or bottom >= top:
+            raise ValueError("Межі обрізання не перетинаються зі сценами")
+
+    if np.isscalar(resolution):
+        resolution = (resolution, resolution)
+    width = max(math.ceil((right - left) / resolution[0] - 1e-9), 1)
+    height = max(math.ceil((top - bottom) / resolution[1] - 1e-9), 1)
+    transform = rasterio.Affine(resolution[0], 0, left, 0, -resolution[1], top)
+    return crs, transform, width, height
+
+
+def creation_options(dtype, block_size=BLOCK_SIZE, compress=COMPRESS):
+    # тайловий стиснений GeoTIFF замість смугового нестисненого (типового для GDAL)
+    options = {'tiled': True, 'blockxsize': block_size, 'blockysize': block_size}
+    if compress:
+        options['compress'] = compress
+        options['predictor'] = 3 if np.issubdtype(np.dtype(dtype), np.floating) else 2
+        # тайли стискаються паралельно в потоках GDAL
+        options['num_threads'] = 'all_cpus'
+        if compress.lower() == 'deflate':
+            options['zlevel'] = DEFLATE_LEVEL
+    return options
+
+
+def gdal_creation_args(dtype='uint16', block_size=BLOCK_SIZE, compress=COMPRESS):
+    # ті самі параметри для утиліт GDAL з командного рядка (-co KEY=VALUE)
+    args = []
+    for key, value in creation_options(dtype, block_size, compress).items():
+        args += ['-co', f"{key.upper()}={'YES' if value is True else str(value).upper()}"]
+    return args
+
+
+def overview_factors(width, height, min_size=OVERVIEW_MIN_SIZE):
+    # 2, 4, 8, ... поки огляд не стане меншим за min_size
+    factors = []
+    factor = 2
+    while min(width, height) / factor >= min_size:
+        factors.append(factor)
+        factor *= 2
+    return factors
+
+
+def build_overviews(dataset, resampling='average'):
+    # огляди у відкритому для запису датасеті (режим 'w' або 'r+')
+    factors = overview_factors(dataset.width, dataset.height)
+    if not factors:
+        return factors
+    # внутрішні огляди GDAL стискає лише за окремими параметрами *_OVERVIEW
+    config = {}
+    if dataset.compression is not None:
+        config['COMPRESS_OVERVIEW'] = dataset.compression.value
+        config['PREDICTOR_OVERVIEW'] = 3 if np.issubdtype(np.dtype(dataset.dtypes[0]), np.floating) else 2
+        config['ZLEVEL_OVERVIEW'] = DEFLATE_LEVEL
+    with rasterio.Env(**config):
+        dataset.build_overviews(factors, Resampling[resampling])
+    dataset.update_tags(ns='rio_overview', resampling=resampling)
+    return factors
+
+
+def add_overviews(path, resampling='average'):
+    # огляди для вже записаного файлу (напр. результату gdal_pansharpen.py)
+    with rasterio.open(path, 'r+') as dataset:
+        return build_overviews(dataset, resampling)
+
+
+def block_windows(width, height, block_size=BLOCK_SIZE):
+    # вікна по block_size x block_size пікселів (крайні - менші)
+    for row in range(0, height, block_size):
+        for col in range(0, width, block_size):
+            yield windows.Window(col, row, min(block_size, width - col), min(block_size, height - row))
+
+
+class _BlockReader:
+    """
+    Читає вікно результату з усіх каналів усіх сцен через WarpedVRT на сітку результату:
+    стекування, перепроєктування й мозаїка без проміжних файлів.
+    Кожен потік відкриває власні датасети - rasterio-датасети не потокобезпечні.
+    """
+
+    def __init__(self, scenes, crs, transform, width, height, nodata, resampling, clip):
+        self.scenes = [list(scene.values()) for scene in scenes]
+        self.crs, self.transform, self.width, self.height = crs, transform, width, height
+        self.nodata, self.resampling, self.clip = nodata, resampling, clip
+        self._local = threading.local()
+        self._opened = []
+        self._lock = threading.Lock()
+
+        with rasterio.open(self.scenes[0][0]) as src:
+            self.dtype = src.dtypes[0]
+        # межі сцен у сітці результату - щоб не читати сцени, що не потрапляють у вікно
+        self.scene_bounds = []
+        for scene in self.scenes:
+            with rasterio.open(scene[0]) as src:
+                self.scene_bounds.append(transform_bounds(src.crs, crs, *src.bounds, densify_pts=21))
+
+    def _vrts(self):
+        vrts = getattr(self._local, 'vrts', None)
+        if vrts is None:
+            vrts = []
+            for scene in self.scenes:
+                bands = []
+                for path in scene:
+                    src = rasterio.open(path)
+                    vrt = WarpedVRT(src, crs=self.crs, transform=self.transform, width=self.width,
+                                    height=self.height, resampling=self.resampling,
+                                    src_nodata=src.nodata if src.nodata is not None else self.nodata,
+                                    nodata=self.nodata)
+                    bands.append(vrt)
+                    with self._lock:
+                        self._opened += [vrt, src]
+                vrts.append(bands)
+            self._local.vrts = vrts
+        return vrts
+
+    def read(self, window):
+        out = np.full((len(self.scenes[0]), int(window.height), int(window.width)), self.nodata, dtype=self.dtype)
+        window_transform = windows.transform(window, self.transform)
+        outside = None
+        if self.clip is not None:
+            outside = geometry_mask(self.clip, out_shape=out.shape[1:], transform=window_transform)
+            if outside.all():
+                return out
+
+        left, bottom, right, top = windows.bounds(window, self.transform)
+        for bands, (s_left, s_bottom, s_right, s_top) in zip(self._vrts(), self.scene_bounds):
+            if s_right <= left or s_left >= right or s_top <= bottom or s_bottom >= top:
+                continue
+            for b, vrt in enumerate(bands):
+                data = vrt.read(1, window=window)
+                # пізніші сцени перекривають попередні лише там, де мають дані (gdal_merge -n nodata)
+                valid = data != self.nodata
+                out[b][valid] = data[valid]
+
+        if outside is not None:
+            out[:, outside] = self.nodata
+        return out
+
+    def close(self):
+        for dataset in self._opened:
+            dataset.close()
+        self._opened = []
+
+
+def mosaic(scenes, out_path, dst_crs=None, clip=None, resolution=None, nodata=0, resampling='nearest',
+           block_size=BLOCK_SIZE, n_jobs=None, compress=COMPRESS, overviews=True, **options):
+    """
+    Стекування каналів, перепроєктування, мозаїка та обрізання за один потоковий прохід
+    (замість gdal_merge.py -separate -> gdalwarp -> gdal_merge.py -> gdalwarp -cutline).
+
+    Параметри:
+    scenes (list): Сцени; кожна - словник {канал: шлях}, напр. {'B02': ..., 'B03': ..., ...}.
+    Канали стають смугами результату в порядку словника.
+    out_path (str): Вихідний GeoTIFF (тайловий, блоки block_size x block_size, стиснений, з оглядами).
+    dst_crs: CRS результату (напр. 'EPSG:4326'); None - CRS першого каналу (без перепроєктування).
+    clip (list або None): GeoJSON-геометрії в dst_crs (напр. read_shapes(...)); поза ними - nodata.
+    resolution: Розмір пікселя в одиницях dst_crs; None - як у першого каналу.
+    nodata: Значення "немає даних" у вхідних і вихідному растрах.
+    resampling (str): Метод перевибірки ('nearest', 'bilinear', 'cubic', ...).
+    block_size (int): Розмір блоку; пікова пам'ять - кілька блоків на потік, а не сцена.
+    n_jobs (int або None): Кількість потоків для блоків (None - кількість ядер).
+    compress (str або None): Стиснення ('deflate', 'lzw'; None - без стиснення).
+    overviews (bool): Чи будувати огляди (для швидких попередніх переглядів).
+    options: Додаткові параметри GeoTIFF (напр. zlevel=6).
+
+    Повертає:
+    out_path.
+    """
+    scenes = [dict(scene) for scene in scenes]
+    crs, transform, width, height = output_grid(scenes, dst_crs, resolution, clip)
+    reader = _BlockReader(scenes, crs, transform, width, height, nodata, Resampling[resampling], clip)
+
+    profile = {'driver': 'GTiff', 'crs': crs, 'transform': transform, 'width': width, 'height': height,
+               'count': len(scenes[0]), 'dtype': reader.dtype, 'nodata': nodata,
+               **creation_options(reader.dtype, block_size, compress), **options}
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    n_jobs = n_jobs or os.cpu_count()
+    try:
+        with rasterio.open(out_path, 'w', **profile) as dst:
+            for b, name in enumerate(scenes[0], start=1):
+                dst.set_band_description(b, name)
+            blocks = block_windows(width, height, block_size)
+            if n_jobs == 1:
+                for window in blocks:
+                    dst.write(reader.read(window), window=window)
+            else:
+                # у черзі не більше 2 блоків на потік - пам'ять не росте з розміром сцени
+                with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                    pending = []
+                    for window in blocks:
+                        pending.append((window, executor.submit(reader.read, window)))
+                        if len(pending) >= 2 * n_jobs:
+                            done_window, future = pending.pop(0)
+                            dst.write(future.result(), window=done_window)
+                    for done_window, future in pending:
+                        dst.write(future.result(), window=done_window)
+            if overviews:
+                build_overviews(dst)
+    finally:
+        reader.close()
+    return out_path
+
+
+def stack_bands(bands, out_path, **kwargs):
+    # один багатоканальний GeoTIFF зі сцени (як gdal_merge.py -separate)
+    return mosaic([bands], out_path, **kwargs)
+
+
+def overview_level(dataset, max_size=PREVIEW_SIZE):
+    """
+    Номер огляду (для rasterio.open(..., overview_level=...)), найменшого з тих,
+    що ще не менші за max_size по довшій стороні; None - потрібна повна роздільність.
+    """
+    level = None
+    for i, factor in enumerate(dataset.overviews(1)):
+        if max(dataset.width, dataset.height) / factor < max_size:
+            break
+        level = i
+    return level
+
+
+def read_preview(path, bands=(1, 2, 3), max_size=PREVIEW_SIZE):
+    # зменшена копія каналів для показу: читається з відповідного огляду, а не з повної роздільності
+    with rasterio.open(path) as dataset:
+        level = overview_level(dataset, max_size)
+        scale = max(1, max(dataset.width, dataset.height) / max_size)
+        shape = (len(bands), max(1, round(dataset.height / scale)), max(1, round(dataset.width / scale)))
+    with rasterio.open(path, **({} if level is None else {'overview_level': level})) as dataset:
+        return dataset.read(list(bands), out_shape=shape, resampling=Resampling.average)
+
+
+def show_preview(path, title=None, bands=(1, 2, 3), max_size=PREVIEW_SIZE, **kwargs):
+    # замість show(raster.read([1, 2, 3]), adjust=True) - без декодування всієї сцени
+    from rasterio.plot import show
+    return show(read_preview(path, bands, max_size), adjust=True, title=title, **kwargs)
@@ -0,0 +1,9 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# модулі лаб імпортуються за назвою, як у ноутбуках і benchmarks/suites.py;
+# синтетичні дані тестів - ті самі генератори, що й у бенчмарків
+for folder in (ROOT, *(os.path.join(ROOT, lab) for lab in ('lab4', 'lab5', 'lab6', 'lab7', 'benchmarks'))):
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
@@ -0,0 +1,120 @@
+import os
+import zipfile
+
+import pytest
+
+from archive_extract import extract_archives, MANIFEST_NAME
+
+SENTINEL = 'S2A_MSIL2A_20190821T085601_N0213_R007_T36UUA_20190821T115206'
+LANDSAT = 'LC08_L1TP_182025_20190830_20190903_01_T1'
+SHAPES = ['Kyiv_regions.shp', 'Kyiv_regions.shx', 'Kyiv_regions.dbf', 'Kyiv_regions.prj']
+
+
+def payload(name):
+    return (name * 50).encode()
+
+
+def write_zip(path, members):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+
+def write_archives(data_dir):
+    # Sentinel-2 SAFE з потрібними й зайвими каналами та межами областей
+    granule = f"{SENTINEL}.SAFE/GRANULE/L2A_T36UUA/IMG_DATA"
+    sentinel = {f"{granule}/R60m/T36UUA_B{band}_60m.jp2": payload(band) for band in ('02', '03', '04', '8A', '11')}
+    sentinel[f"{granule}/R10m/T36UUA_B02_10m.jp2"] = payload('10m')
+    sentinel.update({name: payload(name) for name in SHAPES})
+    write_zip(os.path.join(data_dir, f"{SENTINEL}.zip"), sentinel)
+
+    # Landsat: канали у вкладеному архіві
+    nested = os.path.join(data_dir, "nested.tmp")
+    write_zip(nested, {f"{LANDSAT}/{LANDSAT}_B{band}.TIF": payload(f"L{band}") for band in (1, 2, 3, 4, 8, 10)})
+    with open(nested, 'rb') as f:
+        write_zip(os.path.join(data_dir, f"{LANDSAT}.zip"), {f"{LANDSAT}.zip": f.read(), "README.txt": b"x"})
+    os.remove(nested)
+
+
+@pytest.fixture
+def archives(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    write_archives(str(data_dir))
+    return str(data_dir), str(tmp_path / "full_data")
+
+
+def extracted_files(out_dir):
+    return sorted(os.path.relpath(os.path.join(root, name), out_dir).replace(os.sep, '/')
+                  for root, _, files in os.walk(out_dir) for name in files if name != MANIFEST_NAME)
+
+
+def test_extracts_needed_members_into_renamed_folders(archives):
+    data_dir, out_dir = archives
+    summary = extract_archives(data_dir, out_dir, n_jobs=2)
+    granule = "data_sentinel_A/GRANULE/L2A_T36UUA/IMG_DATA/R60m"
+    assert extracted_files(out_dir) == sorted(
+        [f"{granule}/T36UUA_B{band}_60m.jp2" for band in ('02', '03', '04', '8A')]
+        + [f"data_lanset_A/{LANDSAT}_B{band}.TIF" for band in (2, 3, 4, 8)]
+        + SHAPES)
+    assert summary[f"{LANDSAT}.zip"] == {'extracted': 4, 'skipped': 0, 'cached': False}
+    with open(os.path.join(out_dir, f"data_lanset_A/{LANDSAT}_B8.TIF"), 'rb') as f:
+        assert f.read() == payload('L8')
+
+
+def test_unchanged_archives_are_skipped_by_manifest(archives):
+    data_dir, out_dir = archives
+    extract_archives(data_dir, out_dir, n_jobs=1)
+    summary = extract_archives(data_dir, out_dir, n_jobs=1)
+    assert all(counts['cached'] and counts['extracted'] == 0 for counts in summary.values())
+
+
+def test_missing_and_corrupted_files_are_extracted_again(archives):
+    data_dir, out_dir = archives
+    extract_archives(data_dir, out_dir, n_jobs=1)
+    target = os.path.join(out_dir, f"data_lanset_A/{LANDSAT}_B3.TIF")
+    os.remove(os.path.join(out_dir, 'Kyiv_regions.dbf'))
+    # та сама довжина, інший вміст: помітить лише перевірка CRC
+    with open(target, 'r+b') as f:
+        f.write(b"XXXX")
+
+    summary = extract_archives(data_dir, out_dir, n_jobs=1)
+    assert summary[f"{SENTINEL}.zip"]['extracted'] == 1
+    assert summary[f"{LANDSAT}.zip"]['extracted'] == 0
+
+    summary = extract_archives(data_dir, out_dir, n_jobs=1, verify=True)
+    assert summary[f"{LANDSAT}.zip"] == {'extracted': 1, 'skipped': 3, 'cached': False}
+    with open(target, 'rb') as f:
+        assert f.read() == payload('L3')
+    assert os.path.exists(os.path.join(out_dir, 'Kyiv_regions.dbf'))
+
+
+def test_changed_archive_checks_crc_of_existing_files(archives):
+    data_dir, out_dir = archives
+    extract_archives(data_dir, out_dir, n_jobs=1)
+    target = os.path.join(out_dir, f"data_lanset_A/{LANDSAT}_B4.TIF")
+    with open(target, 'r+b') as f:
+        f.write(b"XXXX")
+    # новий mtime - записам маніфесту вже не довіряю, наявні файли звіряються за CRC
+    archive = os.path.join(data_dir, f"{LANDSAT}.zip")
+    os.utime(archive, (os.stat(archive).st_atime, os.stat(archive).st_mtime + 10))
+
+    summary = extract_archives(data_dir, out_dir, n_jobs=1)
+    assert summary[f"{LANDSAT}.zip"] == {'extracted': 1, 'skipped': 3, 'cached': False}
+    with open(target, 'rb') as f:
+        assert f.read() == payload('L4')
+
+
+@pytest.mark.parametrize('name', ['../evil_b2.tif', '/abs/evil_b2.tif', './../../x/../evil_b2.tif',
+                                  '..\\evil_b2.tif'])
+def test_member_paths_stay_inside_out_dir(tmp_path, name):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    write_zip(str(data_dir / "evil.zip"), {name: b"evil"})
+    out_dir = tmp_path / "nested" / "full_data"
+
+    extract_archives(str(data_dir), str(out_dir), n_jobs=1)
+    written = [os.path.join(root, file) for root, _, files in os.walk(tmp_path) for file in files
+               if file.endswith('evil_b2.tif')]
+    assert len(written) == 1
+    assert os.path.commonpath([written[0], str(out_dir)]) == str(out_dir)
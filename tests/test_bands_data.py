@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bands_data import (profile_missing, FfillImputer, MedianImputer, GroupImputer, Normalizer, Standardizer,
+                        Steps, Step)
+
+
+def gappy_frame(n=120, seed=26):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'viscosity': rng.normal(50, 5, n), 'press_type': rng.choice(['A', 'B'], n).astype(object)})
+    df = df.mask(rng.random(df.shape) < 0.3)
+    # у другому батчі колонка без жодного значення - переноситься значення з першого
+    df.loc[45:80, 'viscosity'] = np.nan
+    return df
+
+
+def test_ffill_fit_transform_matches_pandas():
+    df = gappy_frame()
+    assert FfillImputer().fit_transform(df).equals(df.ffill())
+
+
+def test_ffill_batches_continue_the_fill():
+    df = gappy_frame()
+    first, second, third = df.iloc[:40], df.iloc[40:82], df.iloc[82:]
+    imputer = FfillImputer().fit(first)
+    parts = [first.ffill(), imputer.transform(second), imputer.transform(third)]
+    assert pd.concat(parts).equals(df.ffill())
+
+
+def numeric_frame(n, shift=0.0, seed=26):
+    # дві числові колонки з пропусками і колонка групи, як press_type у cylinder bands
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'press_type': rng.choice(['Motter70', 'Motter94', 'Albert70'], n),
+                       'viscosity': rng.normal(50 + shift, 5, n), 'humidity': rng.normal(80 + shift, 10, n)})
+    df[['viscosity', 'humidity']] = df[['viscosity', 'humidity']].mask(rng.random((n, 2)) < 0.2)
+    return df
+
+
+@pytest.fixture
+def no_refit(monkeypatch):
+    # після fit жоден крок не має знову проходити по даних
+    def forbid(step_class):
+        monkeypatch.setattr(step_class, 'fit', lambda self, df: pytest.fail("transform викликав fit"))
+    return forbid
+
+
+@pytest.mark.parametrize('n_blocks', [1, 7, 64, 1000])
+def test_profile_missing_matches_isnull(n_blocks):
+    df = gappy_frame(n=541)
+    counts, blocks = profile_missing(df, n_blocks)
+    pd.testing.assert_series_equal(counts, df.isnull().sum().sort_values(ascending=False, kind='stable'),
+                                   check_dtype=False)
+    # частка x розмір смуги = кількість пропусків df.isnull() у рядках смуги
+    bounds = list(blocks.index) + [len(df)]
+    assert bounds[0] == 0 and len(blocks) == min(n_blocks, len(df))
+    for (start, stop), (_, fractions) in zip(zip(bounds, bounds[1:]), blocks.iterrows()):
+        expected = df.iloc[start:stop].isnull().sum().to_numpy()
+        np.testing.assert_allclose(fractions.to_numpy() * (stop - start), expected)
+
+
+def test_median_imputer_reuses_training_medians(no_refit):
+    train, batch = numeric_frame(300), numeric_frame(100, shift=100, seed=1)
+    imputer = MedianImputer().fit(train)
+    medians = train[['viscosity', 'humidity']].median()
+    no_refit(MedianImputer)
+
+    out = imputer.transform(batch)
+    pd.testing.assert_frame_equal(out, batch.fillna(medians))
+
+
+def test_group_imputer_reuses_training_groups(no_refit):
+    train, batch = numeric_frame(300), numeric_frame(100, shift=100, seed=1)
+    batch.loc[:9, 'press_type'] = 'WoodHoe70'
+    imputer = GroupImputer('press_type').fit(train)
+    columns = ['viscosity', 'humidity']
+    per_group = train.groupby('press_type')[columns].median()
+    no_refit(GroupImputer)
+
+    out = imputer.transform(batch)
+    # невідома у fit група отримує загальну медіану навчальних даних
+    expected = per_group.reindex(batch['press_type']).fillna(train[columns].median()).set_axis(batch.index)
+    pd.testing.assert_frame_equal(out[columns], batch[columns].fillna(expected))
+    assert out['press_type'].equals(batch['press_type'])
+
+
+@pytest.mark.parametrize('scaler, shift, scale', [
+    (Normalizer, lambda df: df.min(), lambda df: df.max() - df.min()),
+    (Standardizer, lambda df: df.mean(), lambda df: df.std()),
+])
+def test_scalers_reuse_training_statistics(no_refit, scaler, shift, scale):
+    train, batch = numeric_frame(300), numeric_frame(100, shift=100, seed=1)
+    columns = ['viscosity', 'humidity']
+    step = scaler(prefix='s_').fit(train)
+    no_refit(scaler)
+
+    out = step.transform(batch)
+    expected = (batch[columns] - shift(train[columns])) / scale(train[columns])
+    np.testing.assert_allclose(out[['s_viscosity', 's_humidity']].to_numpy(), expected.to_numpy())
+    assert out[columns].equals(batch[columns])
+
+
+def test_steps_transform_new_batch_with_fitted_chain(no_refit):
+    train, batch = numeric_frame(300), numeric_frame(100, shift=100, seed=1)
+    columns = ['viscosity', 'humidity']
+    steps = Steps(MedianImputer(), Standardizer())
+    fitted = steps.fit_transform(train)
+    np.testing.assert_allclose(fitted[columns].mean(), 0, atol=1e-12)
+    for step_class in (Steps, MedianImputer, Standardizer):
+        no_refit(step_class)
+
+    # стандартизатор навчений на вже заповнених навчальних даних
+    medians = train[columns].median()
+    train_filled = train[columns].fillna(medians)
+    expected = (batch[columns].fillna(medians) - train_filled.mean()) / train_filled.std()
+    np.testing.assert_allclose(steps.transform(batch)[columns].to_numpy(), expected.to_numpy())
+
+
+def test_step_is_abstract():
+    with pytest.raises(TypeError):
+        Step()
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+from rasterio.transform import from_origin
+
+from pansharpen_eval import compare_rasters
+
+X0, Y0 = 300000, 5700000
+
+
+def write_raster(path, data, x0=X0, y0=Y0, resolution=30, nodata=None):
+    with rasterio.open(path, 'w', driver='GTiff', width=data.shape[2], height=data.shape[1], count=data.shape[0],
+                       dtype=data.dtype, crs='EPSG:32636', transform=from_origin(x0, y0, resolution, resolution),
+                       nodata=nodata) as dst:
+        dst.write(data)
+    return str(path)
+
+
+@pytest.fixture
+def reference(tmp_path):
+    data = (np.random.default_rng(26).random((3, 300, 400)) * 1000 + 100).astype(np.uint16)
+    return data, write_raster(tmp_path / "reference.tif", data)
+
+
+def test_aligned_identical(tmp_path, reference):
+    data, ref_path = reference
+    overall = compare_rasters(ref_path, write_raster(tmp_path / "same.tif", data), block_size=128).overall()
+    assert overall['n'] == data.size
+    assert overall['mse'] == 0 and overall['r2'] == 1
+
+
+def test_smaller_prediction_without_nodata(tmp_path, reference):
+    # прогноз покриває лише чверть еталона і не має nodata: решта не має рахуватися нулями
+    data, ref_path = reference
+    pred_path = write_raster(tmp_path / "part.tif", data[:, :150, :200])
+    overall = compare_rasters(ref_path, pred_path, block_size=128).overall()
+    assert overall['n'] == 3 * 150 * 200
+    assert overall['mse'] == 0 and overall['r2'] == 1
+
+
+def test_shifted_coarser_prediction(tmp_path, reference):
+    # інша роздільність і зсув сітки: рахуються лише пікселі в межах прогнозу
+    data, ref_path = reference
+    coarse = data[:, ::2, ::2][:, :100, :120]
+    pred_path = write_raster(tmp_path / "coarse.tif", coarse, x0=X0 + 60 * 20, y0=Y0 - 60 * 10, resolution=60)
+    stats = compare_rasters(ref_path, pred_path, block_size=128)
+    covered = 3 * (100 * 2) * (120 * 2)
+    assert stats.overall()['n'] == covered
+    assert (stats.band_table()['n'] == covered // 3).all()
+
+
+def test_nodata_pixels_excluded(tmp_path, reference):
+    data, ref_path = reference
+    predicted = data.copy()
+    predicted[:, :10] = 0
+    pred_path = write_raster(tmp_path / "nodata.tif", predicted[:, :150, :200], nodata=0)
+    overall = compare_rasters(ref_path, pred_path, block_size=128).overall()
+    assert overall['n'] == 3 * 140 * 200
+    assert overall['mse'] == 0
+
+
+def test_metrics_match_sklearn_on_valid_pixels(tmp_path, reference):
+    # зашумлений прогноз на грубішій сітці з nodata: метрики як у sklearn по пікселях, що порівнюються
+    metrics = pytest.importorskip("sklearn.metrics")
+    data, ref_path = reference
+    rng = np.random.default_rng(7)
+    coarse = data[:, ::2, ::2][:, :100, :150].astype(np.int32) + rng.integers(-80, 80, (3, 100, 150))
+    coarse = np.clip(coarse, 1, None).astype(np.uint16)
+    coarse[:, :5] = 0
+    pred_path = write_raster(tmp_path / "noisy.tif", coarse, x0=X0 + 60 * 10, y0=Y0 - 60 * 20, resolution=60, nodata=0)
+
+    overall = compare_rasters(ref_path, pred_path, block_size=96).overall()
+
+    # той самий прогноз на сітці еталона: кожен піксель 60 м - блок 2x2 пікселів 30 м
+    predicted = np.zeros_like(data)
+    predicted[:, 40:240, 20:320] = coarse.repeat(2, axis=1).repeat(2, axis=2)
+    valid = predicted != 0
+    assert overall['n'] == valid.sum() == 3 * 190 * 300
+    assert overall['r2'] == pytest.approx(metrics.r2_score(data[valid], predicted[valid]), rel=1e-12)
+    assert overall['mse'] == pytest.approx(metrics.mean_squared_error(data[valid], predicted[valid]), rel=1e-12)
+    assert overall['mse'] > 0
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from power_query import TASKS, Col
+from suites import synthetic_power
+
+
+@pytest.fixture(scope='module')
+def power():
+    return synthetic_power(50_000)
+
+
+@pytest.mark.parametrize('name', sorted(TASKS))
+def test_backends_agree(power, name):
+    query = TASKS[name]
+    expected = query.indices(power['columns'], backend='numpy')
+    assert len(expected)
+    np.testing.assert_array_equal(query.indices(power['frame'], backend='pandas'), expected)
+    np.testing.assert_array_equal(query.indices(power['columns'], backend='pandas'), expected)
+    np.testing.assert_array_equal(query.indices(power['columns'], backend='chunked', chunksize=4096), expected)
+
+
+def test_pandas_backend_evaluates_series(power):
+    where = ~(Col('Voltage') > 235) | (Col('hour') >= 18)
+    mask = where.evaluate_frame(power['frame'])
+    assert mask.index.equals(power['frame'].index)
+    np.testing.assert_array_equal(np.flatnonzero(mask.to_numpy()),
+                                  np.flatnonzero(where.evaluate(power['columns'], 0, len(power['frame']))))
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+from rasterio.features import geometry_mask
+from rasterio.merge import merge
+
+from raster_pipeline import mosaic
+from suites import synthetic_scenes
+
+# 250 пікселів - зсув сцени B (0.8 і 0.2 розміру) ціле число пікселів, тож сітки збігаються
+SIZE = 250
+
+
+@pytest.fixture(scope='module')
+def scenes():
+    return synthetic_scenes(SIZE)['scenes']
+
+
+def read_all(path):
+    with rasterio.open(path) as src:
+        return src.read(), src.transform, src.nodata
+
+
+def test_same_crs_mosaic_matches_rasterio_merge(tmp_path, scenes):
+    data, transform, _ = read_all(mosaic(scenes, str(tmp_path / "mosaic.tif"), block_size=64, n_jobs=2))
+    for b, band in enumerate(scenes[0]):
+        sources = [rasterio.open(scene[band]) for scene in scenes]
+        try:
+            # як gdal_merge.py: пізніша сцена перекриває попередню там, де має дані
+            expected, expected_transform = merge(sources, nodata=0, method='last')
+        finally:
+            for src in sources:
+                src.close()
+        assert transform == expected_transform
+        np.testing.assert_array_equal(data[b], expected[0])
+
+
+@pytest.mark.parametrize('dst_crs', [None, 'EPSG:4326'])
+def test_serial_and_parallel_outputs_identical(tmp_path, scenes, dst_crs):
+    serial = read_all(mosaic(scenes, str(tmp_path / "serial.tif"), dst_crs=dst_crs, block_size=64, n_jobs=1))
+    parallel = read_all(mosaic(scenes, str(tmp_path / "parallel.tif"), dst_crs=dst_crs, block_size=64, n_jobs=4))
+    assert serial[1] == parallel[1]
+    np.testing.assert_array_equal(serial[0], parallel[0])
+
+
+def test_pixels_outside_clip_are_nodata(tmp_path, scenes):
+    # трикутник через обидві сцени в їхній CRS (UTM 36N)
+    x0, y0, span = 300000, 5700000, 30 * SIZE
+    clip = [{'type': 'Polygon', 'coordinates': [[(x0 + 0.1 * span, y0 - 0.1 * span), (x0 + 1.6 * span, y0 - 0.3 * span),
+                                                 (x0 + 0.5 * span, y0 - 1.1 * span), (x0 + 0.1 * span, y0 - 0.1 * span)]]}]
+    data, transform, nodata = read_all(mosaic(scenes, str(tmp_path / "clip.tif"), clip=clip, nodata=0,
+                                              block_size=64, n_jobs=2))
+    outside = geometry_mask(clip, data.shape[1:], transform)
+    assert outside.any() and (~outside).any()
+    assert (data[:, outside] == nodata).all()
+    assert (data[:, ~outside] != nodata).mean() > 0.9
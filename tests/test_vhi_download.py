@@ -0,0 +1,151 @@
+import os
+import threading
+import types
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import vhi_download
+from vhi_download import ConnectionPool, fetch_to_file, download_all, vhi_url, split_vhi, row_key, row_has_vhi
+
+
+def noaa_body(province_ID, start_year, end_year, last):
+    # відповідь у форматі NOAA; тижні після last - заглушки з VHI = -1, як для майбутніх тижнів
+    lines = [f"<br>Ukraine, Province:  {province_ID}: Test,  Year: {start_year}-{end_year}, type=Mean<br>",
+             "year,week, SMN,SMT,VCI,TCI, VHI,"]
+    for year in range(start_year, end_year + 1):
+        for week in range(1, 53):
+            vhi = -1 if (year, week) > last else 10 + (province_ID * 7 + year * 3 + week) % 60
+            lines.append(f"{year},{week:3d},  0.100, 270.00,  50.00,  50.00,{vhi:7.2f},")
+    lines[2] = "<tt><pre>" + lines[2]
+    lines.append("</pre></tt>")
+    return "\n".join(lines) + "\n"
+
+
+class NoaaStandIn(BaseHTTPRequestHandler):
+    # keep-alive, як у NOAA: ConnectionPool перевикористовує з'єднання
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            kind = server.plan.pop(0) if server.plan else 'ok'
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        body = noaa_body(int(query['provinceID'][0]), int(query['year1'][0]), int(query['year2'][0]),
+                         server.last).encode()
+
+        if kind == 'error':
+            self._send(500, b"server error")
+        elif kind == 'invalid':
+            self._send(200, b"<html>Service temporarily unavailable</html>")
+        elif kind == 'truncated':
+            # заявлена повна довжина, але з'єднання рветься на половині
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+        else:
+            self._send(200, body)
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def noaa():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), NoaaStandIn)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests, server.plan, server.last = [], [], (2001, 10)
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/get_TS_admin.php"
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    # затримки між спробами записуються замість справжнього очікування
+    recorded = []
+    monkeypatch.setattr(vhi_download, 'time', types.SimpleNamespace(sleep=recorded.append))
+    return recorded
+
+
+def read_rows(file_path):
+    with open(file_path, encoding='utf-8') as f:
+        return split_vhi(f.read())[1]
+
+
+@pytest.mark.parametrize('kind', ['invalid', 'truncated'])
+def test_bad_body_rejected_without_part_file(tmp_path, noaa, delays, kind):
+    noaa.plan = [kind] * 3
+    file_path = str(tmp_path / "VHI-ID_1.csv")
+    with pytest.raises((ValueError, OSError, vhi_download.http.client.HTTPException)):
+        fetch_to_file(vhi_url(1, 2000, 2001, noaa.base_url), file_path, ConnectionPool(5), retries=2, backoff=0.5)
+    assert len(noaa.requests) == 3
+    assert not os.path.exists(file_path)
+    assert not os.path.exists(file_path + ".part")
+
+
+def test_retries_with_exponential_backoff(tmp_path, noaa, delays):
+    noaa.plan = ['error', 'truncated', 'invalid']
+    file_path = str(tmp_path / "VHI-ID_1.csv")
+    assert fetch_to_file(vhi_url(1, 2000, 2001, noaa.base_url), file_path, ConnectionPool(5),
+                         retries=3, backoff=0.5) == file_path
+    assert len(noaa.requests) == 4
+    assert delays == [0.5, 1.0, 2.0]
+    assert len(read_rows(file_path)) == 2 * 52
+    assert not os.path.exists(file_path + ".part")
+
+
+def test_failed_download_keeps_existing_file(tmp_path, noaa, delays):
+    # файл замінюється лише перевіреною повною відповіддю
+    file_path = str(tmp_path / "VHI-ID_1.csv")
+    old = noaa_body(1, 1999, 1999, (1999, 52))
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(old)
+
+    noaa.plan = ['truncated', 'invalid']
+    with pytest.raises(ValueError):
+        fetch_to_file(vhi_url(1, 2000, 2001, noaa.base_url), file_path, ConnectionPool(5), retries=1, backoff=0)
+    with open(file_path, encoding='utf-8') as f:
+        assert f.read() == old
+
+    fetch_to_file(vhi_url(1, 2000, 2001, noaa.base_url), file_path, ConnectionPool(5), retries=0)
+    assert [row_key(row) for row in read_rows(file_path)][0] == (2000, 1)
+    assert sorted(os.listdir(tmp_path)) == ["VHI-ID_1.csv"]
+
+
+def test_incremental_tail_merge_has_no_duplicate_weeks(tmp_path, noaa, delays):
+    folder = str(tmp_path / "lab2_VHI")
+    provinces = [1, 2, 3]
+    first = download_all(provinces, 2000, 2001, folder, max_workers=2, base_url=noaa.base_url, incremental=True)
+    assert all(isinstance(result, str) for result in first.values())
+
+    # NOAA дописав нові тижні: наступний запуск докачує лише хвіст від року останнього тижня
+    noaa.last = (2002, 20)
+    noaa.requests.clear()
+    second = download_all(provinces, 2000, 2002, folder, max_workers=2, base_url=noaa.base_url, incremental=True)
+    assert all(isinstance(result, str) for result in second.values())
+    assert all('year1=2001' in path and 'year2=2002' in path for path in noaa.requests)
+
+    for province_ID in provinces:
+        rows = read_rows(second[province_ID])
+        keys = [row_key(row) for row in rows]
+        assert len(keys) == len(set(keys))
+        assert keys == sorted(keys)
+        assert keys == [(year, week) for year in (2000, 2001, 2002) for week in range(1, 53)]
+        # заглушки 2001 року замінені даними, заглушки лишились лише після (2002, 20)
+        assert all(row_has_vhi(row) == (key <= (2002, 20)) for row, key in zip(rows, keys))
+    assert sorted(os.listdir(folder)) == [f"VHI-ID_{province_ID}.csv" for province_ID in provinces]
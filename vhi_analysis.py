@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+# межі посух за VHI
+EXTREME_DROUGHT = 15
+MODERATE_DROUGHT = 35
+
+
+def filter_years(df, start_year=None, end_year=None):
+    # якщо рік не заданий - беру весь датафрейм
+    if start_year is not None:
+        df = df[df['Year'] >= start_year]
+    if end_year is not None:
+        df = df[df['Year'] <= end_year]
+    return df
+
+
+def calculate_vhi_extremes(df, start_year=None, end_year=None):
+    """
+    Min та max VHI для кожної області та року одним groupby замість циклу по групах.
+
+    Повертає:
+    Датафрейм з колонками province_ID, Year, Min_VHI, Max_VHI.
+    """
+    df = filter_years(df, start_year, end_year)
+    result_df = df.groupby(['province_ID', 'Year'])['VHI'].agg(Min_VHI='min', Max_VHI='max')
+    return result_df.reset_index()
+
+
+def drought_flags_by_year(df):
+    """
+    Один прохід по даним: для кожного року - скільки областей мали хоча б тиждень
+    з екстремальною (VHI < 15) та помірною (15 < VHI < 35) посухою і скільки областей всього.
+    """
+    vhi = df['VHI'].to_numpy()
+    years, year_idx = np.unique(df['Year'].to_numpy(), return_inverse=True)
+    provinces, province_idx = np.unique(df['province_ID'].to_numpy(), return_inverse=True)
+
+    # матриці рік x область: чи є дані / чи була посуха хоча б один тиждень
+    shape = (len(years), len(provinces))
+    present = np.zeros(shape, dtype=bool)
+    present[year_idx, province_idx] = True
+
+    extreme = np.zeros(shape, dtype=bool)
+    mask = vhi < EXTREME_DROUGHT
+    extreme[year_idx[mask], province_idx[mask]] = True
+
+    moderate = np.zeros(shape, dtype=bool)
+    mask = (vhi > EXTREME_DROUGHT) & (vhi < MODERATE_DROUGHT)
+    moderate[year_idx[mask], province_idx[mask]] = True
+
+    return pd.DataFrame({'total': present.sum(axis=1), 'extreme': extreme.sum(axis=1),
+                         'moderate': moderate.sum(axis=1)}, index=pd.Index(years, name='Year'))
+
+
+def drought_count(counts, percentage, type_of_drought, start_year=None, end_year=None):
+    # {рік: (к-сть посушливих областей, відсоток)} для років понад заданий відсоток
+    years = counts.index.to_numpy()
+    drought_areas = counts[type_of_drought].to_numpy()
+    share = drought_areas / counts['total'].to_numpy()
+
+    selected = share > percentage / 100
+    if start_year is not None:
+        selected &= years >= start_year
+    if end_year is not None:
+        selected &= years <= end_year
+
+    return {year: (areas, round(part * 100, 2))
+            for year, areas, part in zip(years[selected].tolist(), drought_areas[selected].tolist(),
+                                         share[selected].tolist())}
+
+
+def format_drought_table(drought_count, percentage, type_of_drought):
+    # виводжу у вигляді таблиці
+    if type_of_drought == "extreme":
+        result_table = f"Роки з екстремальною посухою (де більше {percentage}% областей мають VHI < 15):\n"
+
+    elif type_of_drought == "moderate":
+        result_table = f"Роки з помірною посухою (де більше {percentage}% областей мають VHI від 15 до 35):\n"
+
+    result_table += "-" * 60 + "\n"
+    result_table += f"{'Year':^10} | {'К-сть областей з помірною посухою':^25} | {'Відсоток':^15}\n"
+    result_table += "-" * 60 + "\n"
+
+    for year, (drought_areas, percent) in drought_count.items():
+        result_table += f"{year:^10} | {drought_areas:^25} | {percent:^15}%\n"
+
+    result_table += "-" * 60 + "\n"
+
+    return result_table
+
+
+def drought_years(df, percentage, type_of_drought, start_year=None, end_year=None):
+    """
+    Роки, коли посуха (extreme/moderate) торкнулась більше percentage% областей.
+    Той самий результат, що й цикл по роках, але через drought_flags_by_year.
+    """
+    counts = drought_flags_by_year(filter_years(df, start_year, end_year))
+    return format_drought_table(drought_count(counts, percentage, type_of_drought), percentage, type_of_drought)
+
+
+def drought_years_batch(df, queries):
+    """
+    Обчислює багато запитів (percentage, type_of_drought, start_year, end_year)
+    за один прохід по даним: річні лічильники рахуються один раз, а кожен запит -
+    лише порівняння над масивом років.
+
+    Повертає:
+    Датафрейм з колонками percentage, type_of_drought, start_year, end_year,
+    Year, drought_areas, percent (по рядку на кожен рік, що пройшов поріг).
+    """
+    counts = drought_flags_by_year(df)
+
+    rows = []
+    for query in queries:
+        percentage, type_of_drought, start_year, end_year = (tuple(query) + (None, None))[:4]
+        for year, (drought_areas, percent) in drought_count(counts, percentage, type_of_drought,
+                                                            start_year, end_year).items():
+            rows.append((percentage, type_of_drought, start_year, end_year, year, drought_areas, percent))
+
+    return pd.DataFrame(rows, columns=['percentage', 'type_of_drought', 'start_year', 'end_year',
+                                       'Year', 'drought_areas', 'percent'])
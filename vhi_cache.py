@@ -0,0 +1,50 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Обмежений кеш результатів (LRU) з лічильниками влучань/промахів.
+    Записи прив'язані до версії даних: коли версія змінюється, кеш очищується.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key, factory, version=None):
+        with self._lock:
+            if version != self.version:
+                # дані у сховищі змінились - старі результати вже невалідні
+                self._data.clear()
+                self.version = version
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # рахую поза блокуванням, щоб не гальмувати інші запити
+        value = factory()
+
+        with self._lock:
+            if version == self.version:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data),
+                    "maxsize": self.maxsize, "hit_rate": self.hits / total if total else 0.0}
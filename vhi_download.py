@@ -0,0 +1,226 @@
+import os
+import time
+import datetime
+import threading
+import http.client
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+NOAA_URL = "https://www.star.nesdis.noaa.gov/smcd/emb/vci/VH/get_TS_admin.php"
+CHUNK_SIZE = 64 * 1024
+
+
+def vhi_url(province_ID, start_year, end_year, base_url=NOAA_URL):
+    query = urllib.parse.urlencode({"country": "UKR", "provinceID": province_ID,
+                                    "year1": start_year, "year2": end_year, "type": "Mean"})
+    return f"{base_url}?{query}"
+
+
+def is_valid_vhi(file_path):
+    """
+    Перевіряє, що файл - повна відповідь NOAA: є блок <tt><pre> ... </pre></tt>
+    і хоча б один рядок з даними між ними.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            content = f.read()
+    except OSError:
+        return False
+
+    start = content.find(b"<tt><pre>")
+    end = content.rfind(b"</pre></tt>")
+    if start == -1 or end == -1 or end < start:
+        return False
+
+    # обірваний файл не має закриваючого тегу в кінці
+    if content[end:].strip() != b"</pre></tt>":
+        return False
+    return b"," in content[start + 9:end]
+
+
+class ConnectionPool:
+    """По одному відкритому HTTP(S)-з'єднанню на потік і хост."""
+
+    def __init__(self, timeout=60):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def get(self, scheme, netloc):
+        connections = self._local.__dict__.setdefault("connections", {})
+        conn = connections.get((scheme, netloc))
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = conn_class(netloc, timeout=self.timeout)
+            connections[(scheme, netloc)] = conn
+        return conn
+
+    def drop(self, scheme, netloc):
+        # після помилки з'єднання закриваю, наступна спроба відкриє нове
+        conn = self._local.__dict__.get("connections", {}).pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+
+def fetch_to_file(url, file_path, pool, retries=3, backoff=1.0):
+    """
+    Качає url потоково у тимчасовий файл і атомарно перейменовує його у file_path.
+    Повторює спробу з експоненційною затримкою, якщо запит або перевірка не вдались.
+    """
+    parts = urllib.parse.urlsplit(url)
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+    tmp_path = file_path + ".part"
+
+    for attempt in range(retries + 1):
+        try:
+            conn = pool.get(parts.scheme, parts.netloc)
+            conn.request("GET", target, headers={"Connection": "keep-alive"})
+            response = conn.getresponse()
+            if response.status != 200:
+                response.read()
+                raise OSError(f"HTTP {response.status} для {url}")
+
+            with open(tmp_path, 'wb') as output:
+                while True:
+                    chunk = response.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    output.write(chunk)
+
+            if not is_valid_vhi(tmp_path):
+                raise ValueError(f"Неповний або пошкоджений файл з {url}")
+
+            os.replace(tmp_path, file_path)
+            return file_path
+        except (OSError, ValueError, http.client.HTTPException):
+            pool.drop(parts.scheme, parts.netloc)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def canonical_filename(province_ID):
+    # один файл на область, який доповнюється новими тижнями
+    return f"VHI-ID_{province_ID}.csv"
+
+
+def migrate_legacy_files(province_ID, folder="lab2_VHI"):
+    """
+    Перетворює старі файли VHI-ID_<id>_<дата>_<час>.csv на канонічний:
+    найновіший валідний стає VHI-ID_<id>.csv, решта видаляються.
+    """
+    canonical_path = os.path.join(folder, canonical_filename(province_ID))
+    legacy = sorted((os.path.join(folder, name) for name in os.listdir(folder)
+                     if name.startswith(f"VHI-ID_{province_ID}_") and name.endswith(".csv")),
+                    key=os.path.getmtime, reverse=True)
+    for file_path in legacy:
+        if not os.path.exists(canonical_path) and is_valid_vhi(file_path):
+            os.replace(file_path, canonical_path)
+        else:
+            os.remove(file_path)
+    return canonical_path
+
+
+def split_vhi(content):
+    # текст відповіді NOAA -> (заголовок, рядки з даними, закриваючий тег)
+    start = content.index("<tt><pre>") + len("<tt><pre>")
+    end = content.rindex("</pre></tt>")
+    rows = [line for line in content[start:end].splitlines() if line.strip()]
+    return content[:start], rows, content[end:]
+
+
+def row_key(row):
+    fields = row.split(",")
+    return int(fields[0]), int(fields[1])
+
+
+def row_has_vhi(row):
+    # майбутні тижні поточного року NOAA віддає з VHI = -1
+    return float(row.split(",")[6]) != -1
+
+
+def last_stored_week(file_path):
+    """Останні (Year, Week) з визначеним VHI у файлі або None."""
+    with open(file_path, encoding="utf-8") as f:
+        _, rows, _ = split_vhi(f.read())
+    keys = [row_key(row) for row in rows if row_has_vhi(row)]
+    return max(keys) if keys else None
+
+
+def merge_tail(file_path, tail_path):
+    """
+    Дописує до файлу області лише тижні з tail_path, яких у ньому ще немає.
+    Рядки-заглушки (VHI = -1) після останнього заповненого тижня замінюються новими.
+    """
+    with open(file_path, encoding="utf-8") as f:
+        head, rows, closing = split_vhi(f.read())
+    with open(tail_path, encoding="utf-8") as f:
+        _, new_rows, _ = split_vhi(f.read())
+
+    last = max((row_key(row) for row in rows if row_has_vhi(row)), default=(0, 0))
+    rows = [row for row in rows if row_key(row) <= last]
+    rows += [row for row in new_rows if row_key(row) > last]
+
+    tmp_path = file_path + ".part"
+    with open(tmp_path, "w", encoding="utf-8") as output:
+        output.write(head + "\n".join(rows) + "\n" + closing)
+    os.replace(tmp_path, file_path)
+    return file_path
+
+
+def download_province(province_ID, start_year=1981, end_year=None, folder="lab2_VHI",
+                      pool=None, base_url=NOAA_URL, retries=3, backoff=1.0, incremental=False):
+    """
+    Забезпечує валідний файл VHI-ID_<id>.csv. Без incremental наявний файл пропускається,
+    з incremental - докачуються лише роки, починаючи з останнього збереженого тижня.
+    """
+    end_year = end_year or datetime.date.today().year
+    pool = pool or ConnectionPool()
+    file_path = migrate_legacy_files(province_ID, folder)
+
+    if os.path.exists(file_path) and not is_valid_vhi(file_path):
+        os.remove(file_path)
+
+    if not os.path.exists(file_path):
+        url = vhi_url(province_ID, start_year, end_year, base_url)
+        return fetch_to_file(url, file_path, pool, retries, backoff)
+
+    last = last_stored_week(file_path) if incremental else None
+    if last is None or last[0] > end_year:
+        return file_path
+
+    # запитую лише хвіст: від року останнього збереженого тижня
+    tail_path = file_path + ".tail"
+    fetch_to_file(vhi_url(province_ID, last[0], end_year, base_url), tail_path, pool, retries, backoff)
+    try:
+        return merge_tail(file_path, tail_path)
+    finally:
+        os.remove(tail_path)
+
+
+def download_all(province_ids=range(1, 28), start_year=1981, end_year=None, folder="lab2_VHI",
+                 max_workers=8, base_url=NOAA_URL, retries=3, backoff=1.0, timeout=60, incremental=False):
+    """
+    Паралельно качає файли для всіх областей. Вже наявні валідні файли пропускає
+    або, з incremental=True, доповнює новими тижнями.
+
+    Повертає:
+    Словник {province_ID: шлях до файлу або виняток, якщо всі спроби не вдались}.
+    """
+    os.makedirs(folder, exist_ok=True)
+    pool = ConnectionPool(timeout)
+
+    def task(province_ID):
+        return download_province(province_ID, start_year, end_year, folder,
+                                 pool, base_url, retries, backoff, incremental)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {province_ID: executor.submit(task, province_ID) for province_ID in province_ids}
+        for province_ID, future in futures.items():
+            try:
+                results[province_ID] = future.result()
+            except Exception as e:
+                results[province_ID] = e
+    return results
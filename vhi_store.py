@@ -0,0 +1,343 @@
+import os
+import json
+import warnings
+import threading
+import numpy as np
+import pandas as pd
+
+# кеш у Parquet потребує pyarrow; без нього просто парсимо CSV
+try:
+    import pyarrow # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+# колонки сирого CSV з порталу NOAA
+RAW_COLUMNS = ["Year", "Week", "SMN", "SMT", "VCI", "TCI", "VHI", "empty"]
+# колонки з індексами
+INDEX_COLUMNS = ["SMN", "SMT", "VCI", "TCI", "VHI"]
+# компактні типи колонок у сховищі
+COLUMN_DTYPES = {"province_ID": np.int8, "Year": np.int16, "Week": np.int8,
+                 **{col: np.float32 for col in INDEX_COLUMNS}}
+
+# області 12 та 20 відкидаються (як у лабі 2)
+EXCLUDED_PROVINCES = (12, 20)
+
+# словник між старими (NOAA) і новими індексами областей
+PROVINCE_MAPPING = {
+    1: 22, 2: 24, 3: 23, 4: 25, 5: 3, 6: 4, 7: 8, 8: 19, 9: 20, 10: 21,
+    11: 9, 13: 10, 14: 11, 15: 12, 16: 13, 17: 14, 18: 15, 19: 16,
+    21: 17, 22: 18, 23: 6, 24: 1, 25: 2, 26: 7, 27: 5,
+}
+
+# таблиця перекодування: індекс - старий айді, значення - новий
+_PROVINCE_LOOKUP = np.arange(28, dtype=np.int8)
+for _old_id, _new_id in PROVINCE_MAPPING.items():
+    _PROVINCE_LOOKUP[_old_id] = _new_id
+
+
+def province_from_filename(file_name):
+    # VHI-ID_<id>.csv або старе VHI-ID_<id>_<дата>_<час>.csv -> id
+    return int(os.path.splitext(file_name)[0].split('_')[1])
+
+
+def read_vhi_file(file_path, province_ID):
+    """
+    Зчитує один CSV-файл NOAA та чистить його так само, як dataframer,
+    але одразу у компактних типах (айді області ще не перекодований).
+    """
+    df = pd.read_csv(file_path, header=1, names=RAW_COLUMNS)
+    df.at[0, "Year"] = df.at[0, "Year"][9:] # виправляю рік у стовпці Year
+
+    df = df.iloc[:-1] # відкидаю останній рядок
+    df = df.loc[df["VHI"] != -1] # відкидаю рядки з невизначеним VHI
+    df = df.drop("empty", axis=1) # видаляю порожній стовбець
+    df.insert(0, "province_ID", province_ID, True)
+
+    return df.astype(COLUMN_DTYPES)
+
+
+def remap_provinces(df):
+    # перекодовую айді областей через таблицю (без dict.replace по кожному рядку)
+    return df.assign(province_ID=_PROVINCE_LOOKUP[df["province_ID"].to_numpy()])
+
+
+def load_province(folder_path, province_ID, file_names):
+    # всі CSV однієї області -> один очищений фрейм з новим айді
+    fr = [read_vhi_file(os.path.join(folder_path, name), province_ID) for name in file_names]
+    # дублікати можливі лише зі старими файлами з датою в назві
+    df = pd.concat(fr).drop_duplicates() if len(fr) > 1 else fr[0]
+    return remap_provinces(df)
+
+
+class ParquetCache:
+    """
+    Дисковий кеш очищених даних: один Parquet-файл на область (за айді NOAA)
+    та manifest.json з mtime/розміром CSV, з яких він зібраний.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _partition_path(self, province_ID):
+        return os.path.join(self.cache_dir, f"province_{province_ID}.parquet")
+
+    def get(self, province_ID, sources):
+        # повертає фрейм, якщо кеш зібраний саме з цих файлів, інакше None
+        if self.manifest.get(str(province_ID)) != [list(source) for source in sources]:
+            return None
+        try:
+            return pd.read_parquet(self._partition_path(province_ID))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, province_ID, sources, df):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # пишу у тимчасовий файл і перейменовую, щоб не лишити битий кеш
+        path = self._partition_path(province_ID)
+        df.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+        self.manifest[str(province_ID)] = [list(source) for source in sources]
+
+    def prune(self, province_ids):
+        # прибираю області, файлів яких більше немає
+        for key in set(self.manifest) - {str(p) for p in province_ids}:
+            del self.manifest[key]
+            try:
+                os.remove(self._partition_path(key))
+            except OSError:
+                pass
+
+    def save(self):
+        if os.path.isdir(self.cache_dir):
+            self._write_manifest()
+
+
+def parse_range(value):
+    # "1-52" -> (1, 52), "All"/None -> None
+    if value is None or str(value).strip().lower() == 'all':
+        return None
+    start, end = str(value).split('-')
+    return int(start), int(end)
+
+
+class VHICube:
+    """
+    Щільний масив [область, рік, тиждень, індекс] (NaN там, де даних немає).
+    Зрізи по області/роках/тижнях - це view без копіювання.
+    """
+
+    def __init__(self, df):
+        self.index_columns = list(INDEX_COLUMNS)
+        if len(df):
+            self.year0 = int(df["Year"].min())
+            n_years = int(df["Year"].max()) - self.year0 + 1
+            n_weeks = int(df["Week"].max())
+            n_provinces = int(df["province_ID"].max()) + 1
+        else:
+            self.year0, n_years, n_weeks, n_provinces = 0, 0, 0, 0
+
+        # вісь областей індексується самим айді, тому доступ до області - O(1)
+        self.data = np.full((n_provinces, n_years, n_weeks, len(INDEX_COLUMNS)), np.nan, dtype=np.float32)
+        self.data[df["province_ID"].to_numpy(),
+                  df["Year"].to_numpy() - self.year0,
+                  df["Week"].to_numpy() - 1] = df[INDEX_COLUMNS].to_numpy(dtype=np.float32)
+
+        self.years = np.arange(self.year0, self.year0 + n_years)
+        self.weeks = np.arange(1, n_weeks + 1)
+
+    def _bounds(self, year_range, week_range):
+        years = parse_range(year_range) or (self.year0, self.year0 + len(self.years) - 1)
+        weeks = parse_range(week_range) or (1, len(self.weeks))
+        year_slice = slice(max(years[0] - self.year0, 0), max(years[1] - self.year0 + 1, 0))
+        week_slice = slice(max(weeks[0] - 1, 0), max(weeks[1], 0))
+        return year_slice, week_slice
+
+    def grid(self, province_id, data_type, year_range=None, week_range=None):
+        """
+        Повертає (роки, тижні, масив [рік, тиждень]) для однієї області - view у кубі.
+        """
+        year_slice, week_slice = self._bounds(year_range, week_range)
+        k = self.index_columns.index(data_type)
+        return self.years[year_slice], self.weeks[week_slice], self.data[int(province_id), year_slice, week_slice, k]
+
+    def heatmap(self, province_id, data_type, year_range=None, week_range=None):
+        """Те саме, що df.pivot(index='Year', columns='Week', values=data_type) для області."""
+        years, weeks, values = self.grid(province_id, data_type, year_range, week_range)
+        # як і pivot, відкидаю роки та тижні, де немає жодного значення
+        has_year = ~np.isnan(values).all(axis=1)
+        has_week = ~np.isnan(values).all(axis=0)
+        frame = pd.DataFrame(values, index=pd.Index(years, name="Year"), columns=pd.Index(weeks, name="Week"))
+        return frame.loc[has_year, has_week]
+
+    def reduce(self, data_type, func=np.nanmean, year_range=None, week_range=None, axis=(1, 2)):
+        """
+        Векторна агрегація по всіх областях разом, напр. середній VHI області за період:
+        reduce("VHI") -> масив довжиною кількість айді (NaN для відсутніх областей).
+        """
+        year_slice, week_slice = self._bounds(year_range, week_range)
+        k = self.index_columns.index(data_type)
+        with warnings.catch_warnings():
+            # для областей без даних nan-агрегати попереджають про порожній зріз
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            return func(self.data[:, year_slice, week_slice, k], axis=axis)
+
+
+class VHIStore:
+    """
+    Сховище даних VHI на весь процес: фрейм будується один раз,
+    перебудовується лише коли змінюються файли у теці (mtime/розмір).
+    """
+
+    def __init__(self, folder_path="lab2_VHI", use_cache=True):
+        self.folder_path = folder_path
+        self.use_cache = use_cache and HAS_PARQUET
+        self.cache_dir = os.path.join(folder_path, ".cache")
+        self.version = 0 # збільшується при кожній перебудові
+        self._lock = threading.Lock()
+        self._signature = None
+        self._df = None
+        self._views = {}
+        self._province_bounds = {}
+        self._cube = None
+
+    def _csv_files(self):
+        if not os.path.isdir(self.folder_path):
+            return []
+        return sorted(name for name in os.listdir(self.folder_path) if name.endswith('.csv'))
+
+    def _scan(self):
+        # "відбиток" теки: ім'я, mtime та розмір кожного файлу
+        signature = []
+        for name in self._csv_files():
+            stat = os.stat(os.path.join(self.folder_path, name))
+            signature.append((name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _load(self, signature):
+        # групую файли за областями (айді NOAA), області 12 та 20 навіть не читаю
+        by_province = {}
+        for name, mtime, size in signature:
+            province_ID = province_from_filename(name)
+            if province_ID not in EXCLUDED_PROVINCES:
+                by_province.setdefault(province_ID, []).append((name, mtime, size))
+
+        cache = ParquetCache(self.cache_dir) if self.use_cache else None
+        fr = []
+        for province_ID, sources in sorted(by_province.items()):
+            df = cache.get(province_ID, sources) if cache is not None else None
+            if df is None:
+                # кешу немає або CSV новіший - перечитую лише цю область
+                df = load_province(self.folder_path, province_ID, [name for name, _, _ in sources])
+                if cache is not None:
+                    cache.put(province_ID, sources, df)
+            fr.append(df)
+
+        if cache is not None:
+            cache.prune(by_province)
+            cache.save()
+
+        if not fr:
+            return pd.DataFrame({col: np.array([], dtype=dtype) for col, dtype in COLUMN_DTYPES.items()})
+        return pd.concat(fr, ignore_index=True)
+
+    def _build(self, signature):
+        df = self._load(signature)
+
+        # сортую, щоб область та роки в ній були суцільними зрізами
+        df = df.sort_values(["province_ID", "Year", "Week"], kind="stable").reset_index(drop=True)
+
+        provinces = df["province_ID"].to_numpy()
+        ids = np.unique(provinces)
+        starts = np.searchsorted(provinces, ids, side="left")
+        ends = np.searchsorted(provinces, ids, side="right")
+
+        self._df = df
+        self._province_bounds = {int(p): (int(s), int(e)) for p, s, e in zip(ids, starts, ends)}
+        # заздалегідь звужені фрейми під кожен тип індексу
+        self._views = {col: df[["province_ID", "Year", "Week", col]] for col in INDEX_COLUMNS}
+        self._cube = VHICube(df)
+        self._signature = signature
+        self.version += 1
+
+    def refresh(self, force=False):
+        """Перебудовує фрейм, якщо файли змінились. Повертає True, якщо була перебудова."""
+        signature = self._scan()
+        if not force and signature == self._signature:
+            return False
+        with self._lock:
+            if force or signature != self._signature:
+                self._build(signature)
+                return True
+        return False
+
+    def frame(self):
+        """Повний очищений фрейм з новими айді областей."""
+        self.refresh()
+        return self._df
+
+    def cube(self):
+        """Щільний куб [область, рік, тиждень, індекс] для зрізів без фільтрації фрейму."""
+        self.refresh()
+        return self._cube
+
+    def select(self, data_type, province_id=None, week_range=None, year_range=None):
+        """
+        Вибірка ['province_ID', 'Year', 'Week', data_type] за областю та діапазонами.
+        Для однієї області повертається зріз без копіювання.
+        """
+        self.refresh()
+        view = self._views[data_type]
+
+        if province_id is not None:
+            start, end = self._province_bounds.get(int(province_id), (0, 0))
+            view = view.iloc[start:end]
+
+            # роки в межах області відсортовані - шукаю межі бінарним пошуком
+            years = parse_range(year_range)
+            if years is not None:
+                year_values = view["Year"].to_numpy()
+                lo = np.searchsorted(year_values, years[0], side="left")
+                hi = np.searchsorted(year_values, years[1], side="right")
+                view = view.iloc[lo:hi]
+        else:
+            years = parse_range(year_range)
+            if years is not None:
+                view = view.loc[(view["Year"] >= years[0]) & (view["Year"] <= years[1])]
+
+        # фільтр по тижнях потрібен лише, якщо діапазон щось відкидає
+        weeks = parse_range(week_range)
+        if weeks is not None and len(view):
+            week_values = view["Week"].to_numpy()
+            if weeks[0] > week_values.min() or weeks[1] < week_values.max():
+                view = view.loc[(week_values >= weeks[0]) & (week_values <= weeks[1])]
+
+        return view
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(folder_path="lab2_VHI"):
+    # одне сховище на теку на весь процес
+    key = os.path.abspath(folder_path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = VHIStore(folder_path)
+        return _stores[key]